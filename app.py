@@ -1,15 +1,24 @@
 import streamlit as st
 import os
+import re
 import sys
+import functools
 import importlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-if 'services' in sys.modules:
+load_dotenv()
+
+# Hot-reloading the services package costs a re-import on every rerun, so it is opt-in for development
+if os.getenv("DEV_RELOAD") == "1" and 'services' in sys.modules:
     importlib.reload(sys.modules['services'])
 
 from services import AIService, YouTubeService, DatabaseService
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 st.set_page_config(
     page_title="Text 2 Learn",
@@ -54,15 +63,223 @@ def initialize_services():
 
     db_service.init_db()
 
+    threading.Thread(target=warmup_services, args=(ai_service, db_service), daemon=True).start()
+
     return ai_service, youtube_service, db_service
 
 
-def estimate_reading_time(content: str) -> int:
+def warmup_services(ai_service, db_service):
+    """Open the Groq and database connections ahead of the first user request"""
+    try:
+        db_service.ping()
+        ai_service.warmup()
+    except Exception as e:
+        logger.warning("Service warmup failed: %s", e)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_user_courses(_db_service, user_id: int) -> list:
+    """Courses of a user, cached across reruns"""
+    return _db_service.get_user_courses(user_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_course_tree(_db_service, course_id: int):
+    """Course with modules, subtopics and quizzes loaded, cached across reruns"""
+    return _db_service.get_course_tree(course_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_course_progress(_db_service, course_id: int) -> tuple:
+    """(total, generated) subtopic counts of a course, cached across reruns"""
+    return _db_service.get_course_progress(course_id)
+
+
+def clear_content_caches():
+    """Drop cached course reads after subtopic content or quizzes are written"""
+    cached_course_tree.clear()
+    cached_course_progress.clear()
+
+
+def find_video(youtube_service, db_service, keywords: str):
+    """Look up the best video for the keywords, using the database cache before the YouTube API"""
+    video_data = db_service.get_cached_video(keywords)
+    if video_data:
+        return video_data
+
+    if not youtube_service:
+        return None
+
+    video_data = youtube_service.search_best_video(keywords)
+    if not video_data:
+        return None
+
+    db_service.save_cached_video(keywords, video_data['url'], video_data['title'])
+    return {'url': video_data['url'], 'title': video_data['title']}
+
+
+def find_videos(youtube_service, db_service, keyword_list: list) -> dict:
+    """Look up the best video for several keyword strings, searching YouTube once for all cache misses"""
+    videos = {}
+    missing = []
+    for keywords in keyword_list:
+        video_data = db_service.get_cached_video(keywords)
+        if video_data:
+            videos[keywords] = video_data
+        else:
+            missing.append(keywords)
+
+    if missing and youtube_service:
+        for keywords, video_data in youtube_service.search_best_videos_bulk(missing).items():
+            if video_data:
+                db_service.save_cached_video(keywords, video_data['url'], video_data['title'])
+                videos[keywords] = {'url': video_data['url'], 'title': video_data['title']}
+
+    return videos
+
+
+@st.cache_data(ttl=86400, max_entries=2048, show_spinner=False)
+def cached_video_search(_youtube_service, _db_service, keywords: str):
+    """Video lookup for the keywords, cached in memory across sessions
+
+    A miss raises LookupError instead of returning None, because st.cache_data
+    does not cache exceptions; a failed or empty search is retried next time.
+    """
+    video_data = find_video(_youtube_service, _db_service, keywords)
+    if not video_data:
+        raise LookupError(f"No video found for '{keywords}'")
+    return video_data
+
+
+def find_subtopic_video(ai_service, youtube_service, db_service, course_title: str,
+                        module_title: str, subtopic_title: str) -> tuple:
+    """Generate YouTube keywords for a subtopic and look up the best matching video"""
+    keywords = ai_service.generate_youtube_keywords(course_title, module_title, subtopic_title)
+
+    try:
+        video_data = cached_video_search(youtube_service, db_service, keywords)
+    except LookupError:
+        return keywords, None, None
+
+    return keywords, video_data['url'], video_data['title']
+
+
+def save_subtopic_quizzes(db_service, subtopic_id: int, quiz_data: list) -> int:
+    """Store the valid questions of a generated quiz and return how many were saved"""
+    rows = []
+    if quiz_data:
+        for quiz in quiz_data:
+            if (quiz.get('question') and
+                quiz.get('option_a') and
+                quiz.get('option_b') and
+                quiz.get('option_c') and
+                quiz.get('option_d') and
+                quiz.get('correct_answer')):
+
+                rows.append({
+                    'question': quiz.get('question', ''),
+                    'option_a': quiz.get('option_a', ''),
+                    'option_b': quiz.get('option_b', ''),
+                    'option_c': quiz.get('option_c', ''),
+                    'option_d': quiz.get('option_d', ''),
+                    'correct_answer': quiz.get('correct_answer', 'A'),
+                    'explanation': quiz.get('explanation', ''),
+                    'order_index': len(rows)
+                })
+
+    return db_service.create_quizzes_bulk(subtopic_id, rows)
+
+
+@st.cache_resource
+def get_background_executor():
+    """Shared worker pool for generating course content in the background"""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def pregenerate_module(ai_service, youtube_service, db_service, course_title: str, module):
+    """Background job: generate a module's pending subtopics, logging any failure"""
+    # Runs on the shared executor, whose futures are never read, so errors must not escape
+    try:
+        generate_module_content(ai_service, youtube_service, db_service, course_title, module)
+    except Exception:
+        logger.exception("Background generation failed for module '%s'", module.title)
+
+
+def generate_module_content(ai_service, youtube_service, db_service, course_title: str, module):
+    """Generate every pending subtopic of a module with a single bulk LLM call"""
+    # Checked when the worker picks the module up, so subtopics opened in the meantime are skipped
+    pending = [s for s in db_service.get_module_subtopics_light(module.id) if not s.is_generated]
+    if not pending:
+        return
+
+    subtopic_titles = [s.title for s in pending]
+    try:
+        bundles = ai_service.generate_module_bulk(course_title, module.title, subtopic_titles)
+    except Exception as e:
+        # Fall back to one concurrent request set per subtopic; any that still fail
+        # stay ungenerated and are generated on demand when opened
+        logger.warning("Bulk generation failed for module '%s': %s", module.title, e)
+        bundles = ai_service.generate_module_parallel(course_title, module.title, subtopic_titles)
+
+    try:
+        videos = find_videos(youtube_service, db_service, [bundle['keywords'] for bundle in bundles if bundle])
+    except Exception as e:
+        # The generated content is still saved, just without videos
+        logger.warning("Video lookup failed for module '%s': %s", module.title, e)
+        videos = {}
+
+    for subtopic, bundle in zip(pending, bundles):
+        if not bundle:
+            continue
+
+        video_url = None
+        video_title = None
+        video_data = videos.get(bundle['keywords'])
+        if video_data:
+            video_url = video_data['url']
+            video_title = video_data['title']
+
+        try:
+            # Skipped if the subtopic was generated on demand while the bulk call ran
+            if db_service.update_subtopic_content(
+                subtopic.id,
+                bundle['content'],
+                bundle['keywords'],
+                video_url,
+                video_title,
+                count_words(bundle['content'])
+            ):
+                save_subtopic_quizzes(db_service, subtopic.id, bundle['quiz'])
+                clear_content_caches()
+        except Exception:
+            logger.exception("Saving generated content failed for subtopic '%s'", subtopic.title)
+
+
+def start_course_pregeneration(ai_service, youtube_service, db_service, course):
+    """Queue background bulk generation for every module of a new course"""
+    executor = get_background_executor()
+    for module in db_service.get_course_modules(course.id):
+        executor.submit(pregenerate_module, ai_service, youtube_service, db_service, course.title, module)
+
+
+WORD_RE = re.compile(r'\S+')
+
+
+@functools.lru_cache(maxsize=512)
+def count_words(content: str) -> int:
+    """Count whitespace-separated words without materializing a list of them"""
+    return sum(1 for _ in WORD_RE.finditer(content))
+
+
+def estimate_reading_time(content: str, word_count: int = None) -> int:
     """Estimate reading time in minutes based on word count"""
-    if not content:
+    if word_count is None:
+        if not content:
+            return 0
+        word_count = count_words(content)
+    if not word_count:
         return 0
-    words = len(content.split())
-    minutes = max(1, round(words / 200))
+    minutes = max(1, round(word_count / 200))
     return minutes
 
 
@@ -131,7 +348,7 @@ def main():
             st.divider()
 
             st.header("My Courses")
-            courses = db_service.get_user_courses(st.session_state.user_id)
+            courses = cached_user_courses(db_service, st.session_state.user_id)
 
             if courses:
                 for course in courses:
@@ -178,6 +395,8 @@ def main():
                         topic,
                         outline
                     )
+                    cached_user_courses.clear()
+                    start_course_pregeneration(ai_service, youtube_service, db_service, course)
 
                     st.session_state.current_course = course
                     st.success(f"Course '{topic}' created successfully!")
@@ -212,6 +431,8 @@ def main():
                                     full_topic,
                                     outline
                                 )
+                                cached_user_courses.clear()
+                                start_course_pregeneration(ai_service, youtube_service, db_service, course)
                                 st.session_state.current_course = course
                                 st.success(f"Course '{full_topic}' created successfully!")
                                 st.rerun()
@@ -233,16 +454,14 @@ def display_course(ai_service, youtube_service, db_service):
 
     st.title(course.title)
 
-    modules = db_service.get_course_modules(course.id)
+    course_tree = cached_course_tree(db_service, course.id)
 
     if not st.session_state.selected_subtopic:
         st.subheader("Course Outline")
 
-        for module in modules:
+        for module in course_tree.modules:
             with st.expander(f"**Module {module.order_index + 1}: {module.title}**", expanded=True):
-                subtopics = db_service.get_module_subtopics(module.id)
-
-                for subtopic in subtopics:
+                for subtopic in module.subtopics:
                     status = "✅" if subtopic.is_generated else "⭕"
 
                     if st.button(
@@ -255,11 +474,7 @@ def display_course(ai_service, youtube_service, db_service):
                         st.session_state.show_quiz_results = False
                         st.rerun()
 
-        total_subtopics = sum(len(db_service.get_module_subtopics(m.id)) for m in modules)
-        generated_subtopics = sum(
-            sum(1 for s in db_service.get_module_subtopics(m.id) if s.is_generated)
-            for m in modules
-        )
+        total_subtopics, generated_subtopics = cached_course_progress(db_service, course.id)
 
         progress = create_progress_summary(generated_subtopics, total_subtopics)
 
@@ -277,9 +492,9 @@ def display_course(ai_service, youtube_service, db_service):
         st.progress(progress['percentage'] / 100)
 
     else:
-        display_subtopic(ai_service, youtube_service, db_service)
+        display_subtopic(ai_service, youtube_service, db_service, course_tree)
 
-def display_subtopic(ai_service, youtube_service, db_service):
+def display_subtopic(ai_service, youtube_service, db_service, course_tree):
     """Display detailed subtopic content"""
 
     subtopic = st.session_state.selected_subtopic
@@ -293,107 +508,92 @@ def display_subtopic(ai_service, youtube_service, db_service):
     st.header(subtopic.title)
 
     if not subtopic.is_generated:
-        with st.spinner("AI is generating detailed content..."):
-            try:
-                course = st.session_state.current_course
-
-                modules = db_service.get_course_modules(course.id)
-                current_module = None
-                all_module_subtopics = []
-                for m in modules:
-                    subtopics = db_service.get_module_subtopics(m.id)
-                    if any(s.id == subtopic.id for s in subtopics):
-                        current_module = m
-                        all_module_subtopics = subtopics
-                        break
-
-                previous_subtopic_titles = []
-                for s in all_module_subtopics:
-                    if s.id == subtopic.id:
-                        break
-                    if s.is_generated:
-                        previous_subtopic_titles.append(s.title)
-
-                content = ai_service.generate_subtopic_content(
+        # The subtopic may have been generated in the background since the outline was rendered
+        subtopic = db_service.get_subtopic(subtopic.id)
+        st.session_state.selected_subtopic = subtopic
+
+    if not subtopic.is_generated:
+        try:
+            course = st.session_state.current_course
+
+            current_module = db_service.get_module(subtopic.module_id)
+            previous_subtopic_titles = db_service.get_previous_subtopic_titles(
+                subtopic.module_id,
+                subtopic.order_index
+            )
+
+            module_title = current_module.title if current_module else "Module"
+
+            # Attach this session's script context so cached calls work inside the workers
+            with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx,
+                                    initargs=(None, get_script_run_ctx())) as executor:
+                video_future = executor.submit(
+                    find_subtopic_video,
+                    ai_service,
+                    youtube_service,
+                    db_service,
                     course.title,
-                    current_module.title if current_module else "Module",
+                    module_title,
+                    subtopic.title
+                )
+
+                st.divider()
+                content = st.write_stream(ai_service.stream_subtopic_content(
+                    course.title,
+                    module_title,
                     subtopic.title,
                     previous_subtopics=previous_subtopic_titles
-                )
+                ))
 
-                keywords = ai_service.generate_youtube_keywords(
+                quiz_future = executor.submit(
+                    ai_service.generate_quiz,
                     course.title,
-                    current_module.title if current_module else "Module",
-                    subtopic.title
+                    module_title,
+                    subtopic.title,
+                    content or ""
                 )
 
-                video_url = None
-                video_title = None
-                if youtube_service:
-                    video_data = youtube_service.search_best_video(keywords)
-                    if video_data:
-                        video_url = video_data['url']
-                        video_title = video_data['title']
+                with st.spinner("Finding a video tutorial..."):
+                    keywords, video_url, video_title = video_future.result()
 
-                db_service.update_subtopic_content(
+                saved = db_service.update_subtopic_content(
                     subtopic.id,
                     content,
                     keywords,
                     video_url,
-                    video_title
+                    video_title,
+                    count_words(content or "")
                 )
 
-                try:
-                    with st.spinner("Generating quiz questions..."):
-                        quiz_data = ai_service.generate_quiz(
-                            course.title,
-                            current_module.title if current_module else "Module",
-                            subtopic.title,
-                            content[:500] if content else ""  
-                        )
-
-                    quiz_saved_count = 0
-                    if quiz_data:
-                        for i, quiz in enumerate(quiz_data):
-                            if (quiz.get('question') and
-                                quiz.get('option_a') and
-                                quiz.get('option_b') and
-                                quiz.get('option_c') and
-                                quiz.get('option_d') and
-                                quiz.get('correct_answer')):
-
-                                db_service.create_quiz(
-                                    subtopic.id,
-                                    quiz.get('question', ''),
-                                    quiz.get('option_a', ''),
-                                    quiz.get('option_b', ''),
-                                    quiz.get('option_c', ''),
-                                    quiz.get('option_d', ''),
-                                    quiz.get('correct_answer', 'A'),
-                                    quiz.get('explanation', ''),
-                                    i
-                                )
-                                quiz_saved_count += 1
+                # False when background generation stored this subtopic first;
+                # its content and quiz are shown instead of this run's
+                if saved:
+                    try:
+                        with st.spinner("Generating quiz questions..."):
+                            quiz_data = quiz_future.result()
 
-                    if quiz_saved_count > 0:
-                        st.success(f"Generated {quiz_saved_count} quiz questions!")
-                    else:
-                        st.info("ℹNo quiz questions were generated for this topic. Content and video are still available for learning!")
+                        quiz_saved_count = save_subtopic_quizzes(db_service, subtopic.id, quiz_data)
 
-                except Exception as quiz_error:
-                    st.warning(f"Could not generate quiz: {str(quiz_error)}. Content and video are still available!")
+                        if quiz_saved_count > 0:
+                            st.success(f"Generated {quiz_saved_count} quiz questions!")
+                        else:
+                            st.info("ℹNo quiz questions were generated for this topic. Content and video are still available for learning!")
 
-                subtopic = db_service.get_subtopic(subtopic.id)
-                st.session_state.selected_subtopic = subtopic
-                st.rerun()
+                    except Exception as quiz_error:
+                        st.warning(f"Could not generate quiz: {str(quiz_error)}. Content and video are still available!")
+
+            clear_content_caches()
+            subtopic = db_service.get_subtopic(subtopic.id)
+            st.session_state.selected_subtopic = subtopic
+            st.rerun()
 
-            except Exception as e:
-                st.error(f"Error generating content: {str(e)}")
-                return
+        except Exception as e:
+            st.error(f"Error generating content: {str(e)}")
+            return
 
     st.divider()
 
-    reading_time = estimate_reading_time(subtopic.content or "")
+    reading_time = estimate_reading_time(subtopic.content or "", subtopic.word_count)
     st.caption(f"Estimated reading time: {reading_time} min")
 
     tab1, tab2, tab3 = st.tabs(["Content", "Video Tutorial", "Quiz"])
@@ -406,20 +606,45 @@ def display_subtopic(ai_service, youtube_service, db_service):
             st.subheader("Recommended Tutorial")
             st.write(f"**{subtopic.video_title}**")
 
-            video_id = subtopic.video_url.split('watch?v=')[-1].split('&')[0]
-            st.video(f"https://www.youtube.com/watch?v={video_id}")
+            # Rows saved before video_embed_url existed fall back to the watch URL
+            st.video(subtopic.video_embed_url or subtopic.video_url)
 
             st.caption(f"Search keywords: {subtopic.youtube_keywords}")
         else:
             st.info("No video tutorial available for this topic")
 
     with tab3:
-        display_quiz(db_service, subtopic.id)
+        quizzes = next(
+            (s.quizzes for m in course_tree.modules for s in m.subtopics if s.id == subtopic.id),
+            []
+        )
+        display_quiz(quizzes)
+
+def submit_quiz(quiz_ids: list):
+    """Collect the submitted answers and show results if every question was answered
+
+    Runs as the form's submit callback, before the rerun the click triggers, so
+    the results render in that same run without a second st.rerun().
+    """
+    answers = {}
+    for i, quiz_id in enumerate(quiz_ids):
+        answer = st.session_state.get(f"quiz_{quiz_id}")
+        if answer:
+            answers[i] = answer
+
+    st.session_state.quiz_answers = answers
+    if len(answers) < len(quiz_ids):
+        st.session_state.quiz_incomplete = True
+    else:
+        st.session_state.show_quiz_results = True
 
-def display_quiz(db_service, subtopic_id):
-    """Display quiz for the subtopic"""
+def retake_quiz():
+    """Reset the quiz so it can be answered again"""
+    st.session_state.quiz_answers = {}
+    st.session_state.show_quiz_results = False
 
-    quizzes = db_service.get_subtopic_quizzes(subtopic_id)
+def display_quiz(quizzes):
+    """Display quiz for the subtopic"""
 
     if not quizzes:
         st.info("No quiz available for this topic")
@@ -428,28 +653,30 @@ def display_quiz(db_service, subtopic_id):
     st.subheader(f"Quiz ({len(quizzes)} questions)")
 
     if not st.session_state.show_quiz_results:
-        for i, quiz in enumerate(quizzes):
-            st.markdown(f"**Question {i+1}:** {quiz.question}")
-
-            answer = st.radio(
-                "Select your answer:",
-                options=['A', 'B', 'C', 'D'],
-                format_func=lambda x: f"{x}) {getattr(quiz, f'option_{x.lower()}')}",
-                key=f"quiz_{quiz.id}",
-                index=None
-            )
+        # A form defers the rerun until submit instead of rerunning on every answer click
+        with st.form("quiz_form"):
+            for i, quiz in enumerate(quizzes):
+                st.markdown(f"**Question {i+1}:** {quiz.question}")
+
+                st.radio(
+                    "Select your answer:",
+                    options=['A', 'B', 'C', 'D'],
+                    format_func=lambda x: f"{x}) {getattr(quiz, f'option_{x.lower()}')}",
+                    key=f"quiz_{quiz.id}",
+                    index=None
+                )
 
-            if answer:
-                st.session_state.quiz_answers[i] = answer
+                st.divider()
 
-            st.divider()
+            st.form_submit_button(
+                "Submit Quiz",
+                use_container_width=True,
+                on_click=submit_quiz,
+                args=([quiz.id for quiz in quizzes],)
+            )
 
-        if st.button("Submit Quiz", use_container_width=True):
-            if len(st.session_state.quiz_answers) < len(quizzes):
-                st.warning("Please answer all questions before submitting")
-            else:
-                st.session_state.show_quiz_results = True
-                st.rerun()
+        if st.session_state.pop('quiz_incomplete', False):
+            st.warning("Please answer all questions before submitting")
 
     else:
         quiz_dicts = [
@@ -488,10 +715,7 @@ def display_quiz(db_service, subtopic_id):
                 with st.expander("See explanation"):
                     st.write(quiz.explanation)
 
-        if st.button("Retake Quiz", use_container_width=True):
-            st.session_state.quiz_answers = {}
-            st.session_state.show_quiz_results = False
-            st.rerun()
+        st.button("Retake Quiz", use_container_width=True, on_click=retake_quiz)
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,3 @@
-from .models import Base, User, Course, Module, Subtopic, Quiz, UserProgress
+from .models import Base, User, Course, Module, Subtopic, Quiz, UserProgress, VideoCache, SchemaVersion, SCHEMA_VERSION
 
-__all__ = ['Base', 'User', 'Course', 'Module', 'Subtopic', 'Quiz', 'UserProgress']
+__all__ = ['Base', 'User', 'Course', 'Module', 'Subtopic', 'Quiz', 'UserProgress', 'VideoCache', 'SchemaVersion', 'SCHEMA_VERSION']
@@ -1,11 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index, Boolean, text
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
 from datetime import datetime
 
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """Current UTC time computed by the database, matching datetime.utcnow on naive columns"""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, 'postgresql')
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    # now() is in the session time zone, which a naive timestamp column would store as-is
+    return "timezone('utc', now())"
+
+# Bump whenever a model changes so init_db reruns create_all and the migrations
+SCHEMA_VERSION = 2
+
+
 class User(Base):
     """User model for tracking learners"""
     __tablename__ = 'users'
@@ -30,10 +53,11 @@ class Course(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     user = relationship("User", back_populates="courses")
-    modules = relationship("Module", back_populates="course", cascade="all, delete-orphan")
+    modules = relationship("Module", back_populates="course", cascade="all, delete-orphan",
+                           order_by="Module.order_index")
     
     def __repr__(self):
         return f"<Course(title='{self.title}')>"
@@ -42,6 +66,9 @@ class Course(Base):
 class Module(Base):
     """Module model for course modules"""
     __tablename__ = 'modules'
+    __table_args__ = (
+        Index('ix_modules_course_order', 'course_id', 'order_index'),
+    )
     
     id = Column(Integer, primary_key=True)
     course_id = Column(Integer, ForeignKey('courses.id'), nullable=False)
@@ -51,7 +78,8 @@ class Module(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     course = relationship("Course", back_populates="modules")
-    subtopics = relationship("Subtopic", back_populates="module", cascade="all, delete-orphan")
+    subtopics = relationship("Subtopic", back_populates="module", cascade="all, delete-orphan",
+                             order_by="Subtopic.order_index")
     
     def __repr__(self):
         return f"<Module(title='{self.title}')>"
@@ -60,6 +88,12 @@ class Module(Base):
 class Subtopic(Base):
     """Subtopic model for module subtopics"""
     __tablename__ = 'subtopics'
+    __table_args__ = (
+        Index('ix_subtopics_module_order', 'module_id', 'order_index'),
+        # Serves the generated-subtopic reads: get_course_progress and get_previous_subtopic_titles
+        Index('ix_subtopics_generated', 'module_id',
+              postgresql_where=text('is_generated'), sqlite_where=text('is_generated')),
+    )
     
     id = Column(Integer, primary_key=True)
     module_id = Column(Integer, ForeignKey('modules.id'), nullable=False)
@@ -68,13 +102,16 @@ class Subtopic(Base):
     youtube_keywords = Column(Text)
     video_url = Column(String(500))
     video_title = Column(String(500))
+    video_embed_url = Column(String(500))
+    word_count = Column(Integer)
     order_index = Column(Integer, nullable=False)
-    is_generated = Column(Integer, default=0) 
+    is_generated = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     module = relationship("Module", back_populates="subtopics")
-    quizzes = relationship("Quiz", back_populates="subtopic", cascade="all, delete-orphan")
+    quizzes = relationship("Quiz", back_populates="subtopic", cascade="all, delete-orphan",
+                           order_by="Quiz.order_index")
     
     def __repr__(self):
         return f"<Subtopic(title='{self.title}')>"
@@ -83,6 +120,9 @@ class Subtopic(Base):
 class Quiz(Base):
     """Quiz model for storing quiz questions"""
     __tablename__ = 'quizzes'
+    __table_args__ = (
+        Index('ix_quizzes_subtopic_order', 'subtopic_id', 'order_index'),
+    )
     
     id = Column(Integer, primary_key=True)
     subtopic_id = Column(Integer, ForeignKey('subtopics.id'), nullable=False)
@@ -111,9 +151,34 @@ class UserProgress(Base):
     subtopic_id = Column(Integer, ForeignKey('subtopics.id'), nullable=False)
     quiz_id = Column(Integer, ForeignKey('quizzes.id'))
     score = Column(Float)
-    completed = Column(Integer, default=0)  # 0 = incomplete, 1 = complete
+    completed = Column(Boolean, default=False, nullable=False)
     time_spent = Column(Integer)  # in seconds
     created_at = Column(DateTime, default=datetime.utcnow)
     
     def __repr__(self):
         return f"<UserProgress(user_id={self.user_id}, subtopic_id={self.subtopic_id})>"
+
+
+class VideoCache(Base):
+    """Cache of YouTube search results keyed by a hash of the search keywords"""
+    __tablename__ = 'video_cache'
+    
+    keywords_hash = Column(String(64), primary_key=True)
+    keywords = Column(Text, nullable=False)
+    video_url = Column(String(500), nullable=False)
+    video_title = Column(String(500))
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<VideoCache(keywords='{self.keywords[:50]}')>"
+
+
+class SchemaVersion(Base):
+    """Single-row record of the model version the database schema was last migrated to"""
+    __tablename__ = 'schema_version'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<SchemaVersion(version={self.version})>"
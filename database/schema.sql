@@ -3,7 +3,7 @@ CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(100) UNIQUE NOT NULL,
     email VARCHAR(255) UNIQUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (timezone('utc', now()))
 );
 
 -- Courses table
@@ -12,8 +12,8 @@ CREATE TABLE IF NOT EXISTS courses (
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     title VARCHAR(255) NOT NULL,
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (timezone('utc', now())),
+    updated_at TIMESTAMP DEFAULT (timezone('utc', now()))
 );
 
 -- Modules table
@@ -23,7 +23,7 @@ CREATE TABLE IF NOT EXISTS modules (
     title VARCHAR(255) NOT NULL,
     description TEXT,
     order_index INTEGER NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (timezone('utc', now()))
 );
 
 -- Subtopics table
@@ -35,10 +35,12 @@ CREATE TABLE IF NOT EXISTS subtopics (
     youtube_keywords TEXT,
     video_url VARCHAR(500),
     video_title VARCHAR(500),
+    video_embed_url VARCHAR(500),
+    word_count INTEGER,
     order_index INTEGER NOT NULL,
-    is_generated INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    is_generated BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT (timezone('utc', now())),
+    updated_at TIMESTAMP DEFAULT (timezone('utc', now()))
 );
 
 -- Quizzes table
@@ -53,7 +55,7 @@ CREATE TABLE IF NOT EXISTS quizzes (
     correct_answer VARCHAR(1),
     explanation TEXT,
     order_index INTEGER NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (timezone('utc', now()))
 );
 
 -- User Progress table
@@ -63,16 +65,32 @@ CREATE TABLE IF NOT EXISTS user_progress (
     subtopic_id INTEGER NOT NULL REFERENCES subtopics(id) ON DELETE CASCADE,
     quiz_id INTEGER REFERENCES quizzes(id) ON DELETE SET NULL,
     score FLOAT,
-    completed INTEGER DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
     time_spent INTEGER,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (timezone('utc', now()))
+);
+
+-- YouTube video lookup cache
+CREATE TABLE IF NOT EXISTS video_cache (
+    keywords_hash VARCHAR(64) PRIMARY KEY,
+    keywords TEXT NOT NULL,
+    video_url VARCHAR(500) NOT NULL,
+    video_title VARCHAR(500),
+    fetched_at TIMESTAMP DEFAULT (timezone('utc', now()))
+);
+
+-- Model version the schema was last migrated to (single row)
+CREATE TABLE IF NOT EXISTS schema_version (
+    id SERIAL PRIMARY KEY,
+    version INTEGER NOT NULL
 );
 
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_courses_user_id ON courses(user_id);
-CREATE INDEX IF NOT EXISTS idx_modules_course_id ON modules(course_id);
-CREATE INDEX IF NOT EXISTS idx_subtopics_module_id ON subtopics(module_id);
-CREATE INDEX IF NOT EXISTS idx_quizzes_subtopic_id ON quizzes(subtopic_id);
+CREATE INDEX IF NOT EXISTS ix_modules_course_order ON modules(course_id, order_index);
+CREATE INDEX IF NOT EXISTS ix_subtopics_module_order ON subtopics(module_id, order_index);
+CREATE INDEX IF NOT EXISTS ix_subtopics_generated ON subtopics(module_id) WHERE is_generated;
+CREATE INDEX IF NOT EXISTS ix_quizzes_subtopic_order ON quizzes(subtopic_id, order_index);
 CREATE INDEX IF NOT EXISTS idx_user_progress_user_id ON user_progress(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_progress_subtopic_id ON user_progress(subtopic_id);
 
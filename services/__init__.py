@@ -1,5 +1,5 @@
-from .ai_service import AIService
+from .ai_service import AIService, CompletionConfig
 from .youtube_service import YouTubeService
 from .db_service import DatabaseService
 
-__all__ = ['AIService', 'YouTubeService', 'DatabaseService']
+__all__ = ['AIService', 'CompletionConfig', 'YouTubeService', 'DatabaseService']
@@ -1,43 +1,332 @@
 import os
-from groq import Groq
-from typing import Dict, List, Tuple
+import json
+import time
+import hashlib
+import asyncio
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from string import Template
+import httpx
+from groq import Groq, AsyncGroq, APIConnectionError, APITimeoutError
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import re
 
+logger = logging.getLogger(__name__)
+
+# Llama tokenizers average about four characters of English text per token
+CHARS_PER_TOKEN = 4
+QUIZ_CONTEXT_TOKENS = 256
+SENTENCE_END_RE = re.compile(r'[.!?](?=\s)')
+
+QUESTION_RE = re.compile(r'^Question\s+\d+:?', re.IGNORECASE)
+CORRECT_ANSWER_RE = re.compile(r'^Correct Answer:?\s*([A-D])', re.IGNORECASE)
+
+# _parse_quiz states: which part of the current question a prose line belongs to
+READING_QUESTION, READING_OPTIONS, READING_EXPLANATION = range(3)
+
+PROMPT_TEMPLATES = (
+    "course_outline_prompt.txt",
+    "subtopic_content_prompt.txt",
+    "youtube_keywords_prompt.txt",
+    "quiz_generation_prompt.txt",
+    "module_bulk_prompt.txt",
+)
+
+
+# Groq clients are shared per API key across every AIService in the process, so
+# TLS sessions and pooled HTTP/2 connections outlive individual service instances
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_CLIENTS: Dict[Tuple[str, str], object] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Event loop thread for the async client; httpx async connections are bound to one loop
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def get_groq_client(api_key: str) -> Groq:
+    """Get the process-wide Groq client for an API key"""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(('sync', api_key))
+        if client is None:
+            # Retries are handled in AIService._create_completion so they can be logged and backed off
+            client = Groq(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            )
+            _CLIENTS[('sync', api_key)] = client
+        return client
+
+
+def get_async_groq_client(api_key: str) -> AsyncGroq:
+    """Get the process-wide AsyncGroq client for an API key"""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(('async', api_key))
+        if client is None:
+            client = AsyncGroq(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            )
+            _CLIENTS[('async', api_key)] = client
+        return client
+
+
+def run_async(coroutine):
+    """Run a coroutine on the shared event loop thread and wait for its result"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _LOOP).result()
+
+
+@functools.lru_cache(maxsize=None)
+def read_prompt_file(prompt_path: str) -> Template:
+    """
+    Read a prompt file once per process; later calls are served from memory
+    
+    Prompt files use $name placeholders (and $$ for a literal dollar sign), so
+    substituted values never need their braces escaped.
+    """
+    with open(prompt_path, 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+@dataclass
+class CompletionConfig:
+    """Timeout and retry settings for Groq completions"""
+    request_timeout: float = 8.0
+    max_retries: int = 2
+    backoff_base: float = 0.5
+
 
 class AIService:
     """Service for interacting with Groq API to generate course content"""
     
-    def __init__(self, api_key: str):
-        """Initialize Groq client with API key"""
-        self.client = Groq(api_key=api_key)
+    def __init__(self, api_key: str, config: Optional[CompletionConfig] = None,
+                 http_client: Optional[httpx.Client] = None, concurrency: Optional[int] = None,
+                 cache: bool = True, cache_size: int = 1024):
+        """
+        Initialize Groq client with API key
+        
+        The Groq clients are shared by every instance using the same API key. Pass
+        http_client to use a dedicated sync client on that connection pool instead.
+        concurrency caps the number of in-flight async requests (default:
+        GROQ_CONCURRENCY or 8).
+        With cache enabled, responses to identical prompts are kept in an
+        in-memory LRU of cache_size entries and served without calling Groq.
+        """
+        self.config = config or CompletionConfig()
+        if http_client is not None:
+            self.client = Groq(api_key=api_key, max_retries=0, http_client=http_client)
+        else:
+            self.client = get_groq_client(api_key)
+        self.aclient = get_async_groq_client(api_key)
         self.model = "llama-3.3-70b-versatile"
         
-    def _load_prompt_template(self, template_name: str) -> str:
+        self.concurrency = concurrency or int(os.getenv("GROQ_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        
+        self.cache_enabled = cache
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        
+        for template_name in PROMPT_TEMPLATES:
+            try:
+                read_prompt_file(os.path.join("prompts", template_name))
+            except FileNotFoundError:
+                # Reported by _load_prompt_template when the template is actually used
+                pass
+        
+    def _load_prompt_template(self, template_name: str) -> Template:
         """Load a prompt template from the prompts directory"""
         prompt_path = os.path.join("prompts", template_name)
         try:
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return read_prompt_file(prompt_path)
         except FileNotFoundError:
             raise Exception(f"Prompt template '{template_name}' not found")
     
+    def _create_completion(self, prompt: str, temperature: float, max_tokens: int, stream: bool = False):
+        """
+        Create a Groq chat completion, retrying timeouts and connection errors
+        
+        Each attempt is bounded by config.request_timeout. For streamed completions
+        the timeout applies to the wait for each chunk, so long outputs are not cut off.
+        """
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return self.client.chat.completions.create(
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt,
+                        }
+                    ],
+                    model=self.model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    timeout=self.config.request_timeout,
+                )
+            except (APITimeoutError, APIConnectionError) as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self.config.backoff_base * (2 ** attempt)
+                logger.warning(
+                    "Groq request failed (%s), retrying in %.1fs (attempt %d/%d)",
+                    e.__class__.__name__, delay, attempt + 1, self.config.max_retries
+                )
+                time.sleep(delay)
+    
+    def _cache_key(self, prompt: str, temperature: float, max_tokens: int) -> bytes:
+        """Build the response cache key for a completion request"""
+        return hashlib.blake2b(
+            f"{self.model}|{temperature}|{max_tokens}|{prompt}".encode('utf-8'),
+            digest_size=16
+        ).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Return a cached response and mark it recently used, or None on a miss"""
+        if not self.cache_enabled:
+            return None
+        with self._cache_lock:
+            response = self._cache.get(key)
+            if response is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return response
+    
+    def _cache_put(self, key: bytes, response: str):
+        """Store a response, evicting the least recently used entries beyond cache_size"""
+        if not self.cache_enabled or not response:
+            return
+        with self._cache_lock:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get response cache counters (size, hits, misses, evictions)"""
+        with self._cache_lock:
+            return {
+                'size': len(self._cache),
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'evictions': self._cache_evictions
+            }
+    
     def _call_groq(self, prompt: str, temperature: float = 0.7, max_tokens: int = 4000) -> str:
-        """Make a call to Groq API with the given prompt"""
+        """
+        Make a call to Groq API with the given prompt, reusing cached responses
+        
+        The completion is streamed and joined: a non-streamed response sends nothing
+        until it is complete, so the per-read request timeout would cover the whole
+        generation and cut off long outputs such as course outlines.
+        """
+        return "".join(self._stream_groq(prompt, temperature, max_tokens))
+    
+    def _stream_groq(self, prompt: str, temperature: float = 0.7, max_tokens: int = 4000) -> Iterator[str]:
+        """
+        Stream a Groq completion for the given prompt, yielding text deltas as they arrive
+        
+        A cached response is yielded as a single chunk. A streamed response is only
+        cached once it has been read to the end.
+        """
+        key = self._cache_key(prompt, temperature, max_tokens)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model=self.model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return chat_completion.choices[0].message.content
+            stream = self._create_completion(prompt, temperature, max_tokens, stream=True)
+            # Closed on exit, also when the consumer stops early (e.g. a Streamlit rerun),
+            # so the pooled connection is released right away
+            with stream:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        except Exception as e:
+            raise Exception(f"Groq API error: {str(e)}")
+        
+        self._cache_put(key, "".join(parts))
+    
+    async def _acreate_completion(self, prompt: str, temperature: float, max_tokens: int, stream: bool = False):
+        """Async counterpart of _create_completion"""
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return await self.aclient.chat.completions.create(
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt,
+                        }
+                    ],
+                    model=self.model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=stream,
+                    timeout=self.config.request_timeout,
+                )
+            except (APITimeoutError, APIConnectionError) as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self.config.backoff_base * (2 ** attempt)
+                logger.warning(
+                    "Groq request failed (%s), retrying in %.1fs (attempt %d/%d)",
+                    e.__class__.__name__, delay, attempt + 1, self.config.max_retries
+                )
+                await asyncio.sleep(delay)
+    
+    async def _acall_groq(self, prompt: str, temperature: float = 0.7, max_tokens: int = 4000) -> str:
+        """
+        Make an async call to Groq API with the given prompt, reusing cached responses
+        
+        At most self.concurrency requests are in flight. Like _call_groq, the completion
+        is streamed so the request timeout bounds the wait for each chunk.
+        """
+        key = self._cache_key(prompt, temperature, max_tokens)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with self._semaphore:
+                completion_stream = await self._acreate_completion(prompt, temperature, max_tokens, stream=True)
+                async with completion_stream:
+                    parts = []
+                    async for chunk in completion_stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+            response = "".join(parts)
         except Exception as e:
             raise Exception(f"Groq API error: {str(e)}")
+        
+        self._cache_put(key, response)
+        return response
+    
+    def warmup(self):
+        """Send a one-token completion so the first real request reuses a warm connection"""
+        self._create_completion("ping", temperature=0, max_tokens=1)
     
     def generate_course_outline(self, topic: str) -> Dict[str, List[str]]:
         """
@@ -50,7 +339,7 @@ class AIService:
             Dictionary with module titles as keys and lists of subtopics as values
         """
         template = self._load_prompt_template("course_outline_prompt.txt")
-        prompt = template.format(topic=topic)
+        prompt = template.safe_substitute(topic=topic)
         
         response = self._call_groq(prompt, temperature=0.7, max_tokens=3000)
         
@@ -93,6 +382,39 @@ class AIService:
         Returns:
             Detailed markdown-formatted content
         """
+        return "".join(self.stream_subtopic_content(
+            course_title,
+            module_title,
+            subtopic_title,
+            previous_subtopics=previous_subtopics
+        ))
+    
+    def stream_subtopic_content(self, course_title: str, module_title: str, 
+                                subtopic_title: str, previous_subtopics: List[str] = None) -> Iterator[str]:
+        """
+        Stream detailed content for a specific subtopic as it is generated
+        
+        Args:
+            course_title: The course title
+            module_title: The module title
+            subtopic_title: The subtopic title
+            previous_subtopics: List of previously covered subtopic titles in this module
+            
+        Yields:
+            Markdown text deltas in generation order
+        """
+        prompt = self._subtopic_content_prompt(course_title, module_title, subtopic_title, previous_subtopics)
+        return self._stream_groq(prompt, temperature=0.7, max_tokens=4000)
+    
+    async def agenerate_subtopic_content(self, course_title: str, module_title: str,
+                                         subtopic_title: str, previous_subtopics: List[str] = None) -> str:
+        """Async version of generate_subtopic_content"""
+        prompt = self._subtopic_content_prompt(course_title, module_title, subtopic_title, previous_subtopics)
+        return await self._acall_groq(prompt, temperature=0.7, max_tokens=4000)
+    
+    def _subtopic_content_prompt(self, course_title: str, module_title: str,
+                                 subtopic_title: str, previous_subtopics: List[str] = None) -> str:
+        """Build the content generation prompt for a subtopic"""
         template = self._load_prompt_template("subtopic_content_prompt.txt")
         
         if previous_subtopics and len(previous_subtopics) > 0:
@@ -100,15 +422,12 @@ class AIService:
         else:
             prev_text = "None (This is the first subtopic in this module)"
         
-        prompt = template.format(
+        return template.safe_substitute(
             course_title=course_title,
             module_title=module_title,
             subtopic_title=subtopic_title,
             previous_subtopics=prev_text
         )
-        
-        content = self._call_groq(prompt, temperature=0.7, max_tokens=4000)
-        return content
     
     def generate_youtube_keywords(self, course_title: str, module_title: str, 
                                    subtopic_title: str) -> str:
@@ -123,15 +442,25 @@ class AIService:
         Returns:
             Comma-separated keywords
         """
+        prompt = self._youtube_keywords_prompt(course_title, module_title, subtopic_title)
+        keywords = self._call_groq(prompt, temperature=0.5, max_tokens=200)
+        return keywords.strip()
+    
+    async def agenerate_youtube_keywords(self, course_title: str, module_title: str,
+                                         subtopic_title: str) -> str:
+        """Async version of generate_youtube_keywords"""
+        prompt = self._youtube_keywords_prompt(course_title, module_title, subtopic_title)
+        keywords = await self._acall_groq(prompt, temperature=0.5, max_tokens=200)
+        return keywords.strip()
+    
+    def _youtube_keywords_prompt(self, course_title: str, module_title: str, subtopic_title: str) -> str:
+        """Build the YouTube keywords prompt for a subtopic"""
         template = self._load_prompt_template("youtube_keywords_prompt.txt")
-        prompt = template.format(
+        return template.safe_substitute(
             course_title=course_title,
             module_title=module_title,
             subtopic_title=subtopic_title
         )
-        
-        keywords = self._call_groq(prompt, temperature=0.5, max_tokens=200)
-        return keywords.strip()
     
     def generate_quiz(self, course_title: str, module_title: str, 
                       subtopic_title: str, content_summary: str = "") -> List[Dict]:
@@ -147,77 +476,300 @@ class AIService:
         Returns:
             List of quiz questions with options and answers
         """
+        return list(self.stream_quiz(course_title, module_title, subtopic_title, content_summary))
+    
+    def stream_quiz(self, course_title: str, module_title: str,
+                    subtopic_title: str, content_summary: str = "") -> Iterator[Dict]:
+        """
+        Stream quiz questions for a subtopic as the completion arrives
+        
+        Args:
+            course_title: The course title
+            module_title: The module title
+            subtopic_title: The subtopic title
+            content_summary: Brief summary of the content (optional)
+            
+        Yields:
+            Quiz question dictionaries, each as soon as its text is complete
+        """
+        prompt = self._quiz_prompt(course_title, module_title, subtopic_title, content_summary)
+        # Five questions with explanations fit comfortably in 1500 tokens
+        return self._parse_quiz_stream(self._stream_groq(prompt, temperature=0.6, max_tokens=1500))
+    
+    async def agenerate_quiz(self, course_title: str, module_title: str,
+                             subtopic_title: str, content_summary: str = "") -> List[Dict]:
+        """Async version of generate_quiz"""
+        prompt = self._quiz_prompt(course_title, module_title, subtopic_title, content_summary)
+        quiz_text = await self._acall_groq(prompt, temperature=0.6, max_tokens=1500)
+        return self._parse_quiz(quiz_text)
+    
+    def _quiz_prompt(self, course_title: str, module_title: str,
+                     subtopic_title: str, content_summary: str = "") -> str:
+        """Build the quiz generation prompt for a subtopic"""
         template = self._load_prompt_template("quiz_generation_prompt.txt")
         
+        content_summary = self._trim_to_token_budget(content_summary, QUIZ_CONTEXT_TOKENS)
         if not content_summary:
             content_summary = f"Content about {subtopic_title}"
         
-        content_summary = content_summary.replace('{', '{{').replace('}', '}}')
-        
-        prompt = template.format(
+        return template.safe_substitute(
             course_title=course_title,
             module_title=module_title,
             subtopic_title=subtopic_title,
             content_summary=content_summary
         )
+    
+    async def agenerate_subtopic_bundle(self, course_title: str, module_title: str, subtopic_title: str,
+                                        previous_subtopics: List[str] = None) -> Tuple[str, str, List[Dict]]:
+        """
+        Generate content, YouTube keywords and quiz for a subtopic concurrently
         
-        quiz_text = self._call_groq(prompt, temperature=0.6, max_tokens=3000)
-        return self._parse_quiz(quiz_text)
+        The quiz is written from the subtopic title alone, since the content is
+        generated at the same time.
+        
+        Returns:
+            Tuple of (content, keywords, quiz)
+        """
+        content, keywords, quiz = await asyncio.gather(
+            self.agenerate_subtopic_content(course_title, module_title, subtopic_title, previous_subtopics),
+            self.agenerate_youtube_keywords(course_title, module_title, subtopic_title),
+            self.agenerate_quiz(course_title, module_title, subtopic_title)
+        )
+        return content, keywords, quiz
+    
+    async def agenerate_module(self, course_title: str, module_title: str,
+                               subtopic_titles: List[str]) -> List[Optional[Dict]]:
+        """
+        Generate every subtopic of a module concurrently
+        
+        Args:
+            course_title: The course title
+            module_title: The module title
+            subtopic_titles: Subtopic titles of the module, in teaching order
+            
+        Returns:
+            List of dictionaries (title, content, keywords, quiz) in the same shape as
+            generate_module_bulk, with None for subtopics whose generation failed
+        """
+        results = await asyncio.gather(*[
+            self.agenerate_subtopic_bundle(course_title, module_title, title, subtopic_titles[:i])
+            for i, title in enumerate(subtopic_titles)
+        ], return_exceptions=True)
+        
+        bundles = []
+        for title, result in zip(subtopic_titles, results):
+            if isinstance(result, Exception):
+                logger.warning("Generation failed for subtopic '%s': %s", title, result)
+                bundles.append(None)
+                continue
+            content, keywords, quiz = result
+            bundles.append({'title': title, 'content': content, 'keywords': keywords, 'quiz': quiz})
+        
+        return bundles
+    
+    async def agenerate_course(self, course_title: str,
+                               outline: Dict[str, List[str]]) -> Dict[str, List[Optional[Dict]]]:
+        """
+        Generate every subtopic of a course outline concurrently
+        
+        Args:
+            course_title: The course title
+            outline: Dictionary with module titles as keys and lists of subtopics as values
+            
+        Returns:
+            Dictionary with module titles as keys and agenerate_module results as values
+        """
+        results = await asyncio.gather(*[
+            self.agenerate_module(course_title, module_title, subtopic_titles)
+            for module_title, subtopic_titles in outline.items()
+        ])
+        return dict(zip(outline.keys(), results))
+    
+    def generate_module_parallel(self, course_title: str, module_title: str,
+                                 subtopic_titles: List[str]) -> List[Optional[Dict]]:
+        """Synchronous wrapper around agenerate_module"""
+        return run_async(self.agenerate_module(course_title, module_title, subtopic_titles))
+    
+    def generate_course_parallel(self, course_title: str,
+                                 outline: Dict[str, List[str]]) -> Dict[str, List[Optional[Dict]]]:
+        """Synchronous wrapper around agenerate_course"""
+        return run_async(self.agenerate_course(course_title, outline))
+    
+    @staticmethod
+    def _trim_to_token_budget(text: str, max_tokens: int) -> str:
+        """
+        Trim text to roughly max_tokens, ending on the last complete sentence
+        
+        Args:
+            text: Text to trim
+            max_tokens: Approximate token budget
+            
+        Returns:
+            The trimmed text, or the text unchanged if it already fits
+        """
+        text = text.strip()
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        
+        snippet = text[:max_chars + 1]
+        sentence_ends = [match.end() for match in SENTENCE_END_RE.finditer(snippet)]
+        if sentence_ends:
+            return snippet[:sentence_ends[-1]]
+        return snippet[:max_chars].rsplit(' ', 1)[0]
+    
+    def generate_module_bulk(self, course_title: str, module_title: str,
+                             subtopic_titles: List[str]) -> List[Dict]:
+        """
+        Generate content, keywords and quiz for every subtopic of a module in one call
+        
+        Args:
+            course_title: The course title
+            module_title: The module title
+            subtopic_titles: Subtopic titles of the module, in teaching order
+            
+        Returns:
+            List of dictionaries (title, content, keywords, quiz), one per subtopic
+        """
+        template = self._load_prompt_template("module_bulk_prompt.txt")
+        subtopic_list = "\n".join([f"{i}. {title}" for i, title in enumerate(subtopic_titles, 1)])
+        
+        prompt = template.safe_substitute(
+            course_title=course_title,
+            module_title=module_title,
+            subtopic_list=subtopic_list
+        )
+        
+        # Streamed so the request timeout bounds each chunk rather than the whole module
+        response = "".join(self._stream_groq(prompt, temperature=0.7, max_tokens=24000))
+        return self._parse_module_bulk(response, subtopic_titles)
+    
+    def _parse_module_bulk(self, response_text: str, subtopic_titles: List[str]) -> List[Dict]:
+        """Parse and validate the JSON returned by a bulk module generation call"""
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start == -1 or end == -1:
+            raise Exception("Bulk response does not contain a JSON object")
+        
+        try:
+            # strict=False accepts raw newlines and tabs inside strings, which long
+            # markdown and code values often contain
+            data = json.loads(response_text[start:end + 1], strict=False)
+        except json.JSONDecodeError as e:
+            raise Exception(f"Bulk response is not valid JSON: {str(e)}")
+        
+        items = data.get('subtopics') if isinstance(data, dict) else None
+        if not isinstance(items, list) or len(items) != len(subtopic_titles):
+            raise Exception("Bulk response does not contain one entry per subtopic")
+        
+        bundles = []
+        for title, item in zip(subtopic_titles, items):
+            if not isinstance(item, dict) or not item.get('content') or not item.get('keywords'):
+                raise Exception(f"Bulk response is missing content for '{title}'")
+            
+            quiz = []
+            for question in item.get('quiz') or []:
+                if isinstance(question, dict) and self._is_valid_quiz(question):
+                    answer = str(question['correct_answer']).strip().upper()[:1]
+                    if answer in ('A', 'B', 'C', 'D'):
+                        quiz.append({**question, 'correct_answer': answer})
+            
+            bundles.append({
+                'title': title,
+                'content': str(item['content']),
+                'keywords': str(item['keywords']).strip(),
+                'quiz': quiz
+            })
+        
+        return bundles
     
     def _parse_quiz(self, quiz_text: str) -> List[Dict]:
         """Parse AI-generated quiz into structured format"""
-        questions = []
-        lines = quiz_text.strip().split('\n')
+        return list(self._parse_quiz_lines(quiz_text.strip().split('\n')))
+    
+    def _parse_quiz_stream(self, chunks: Iterable[str]) -> Iterator[Dict]:
+        """Parse a streamed quiz, yielding each question as soon as its text is complete"""
+        return self._parse_quiz_lines(self._iter_lines(chunks))
+    
+    @staticmethod
+    def _iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+        """Regroup streamed text deltas into complete lines"""
+        # Deltas of an unfinished line are collected and joined once, not concatenated per delta
+        pending = []
+        for chunk in chunks:
+            if '\n' not in chunk:
+                pending.append(chunk)
+                continue
+            head, *lines, tail = chunk.split('\n')
+            pending.append(head)
+            yield "".join(pending)
+            yield from lines
+            pending = [tail]
+        tail = "".join(pending)
+        if tail:
+            yield tail
+    
+    def _parse_quiz_lines(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """
+        Parse quiz lines into question dictionaries, yielding each one once it is complete
         
+        Single pass over the lines: each line is dispatched on its first characters,
+        and a regex only runs to confirm a question header or read the answer letter.
+        Question and explanation text is collected as lists of lines and joined once
+        the question is complete.
+        """
         current_question = {}
-        reading_explanation = False
+        state = READING_QUESTION
         
         for line in lines:
             line = line.strip()
             if not line:
                 if current_question and self._is_valid_quiz(current_question):
-                    questions.append(current_question.copy())
+                    yield self._join_quiz_parts(current_question)
                     current_question = {}
-                    reading_explanation = False
+                    state = READING_QUESTION
                 continue
             
-            if re.match(r'^Question\s+\d+:?', line, re.IGNORECASE):
+            first = line[0]
+            if first in 'ABCD' and len(line) > 2 and line[1] in '):' and line[2:].strip():
+                current_question[f'option_{first.lower()}'] = line[2:].strip()
+                state = READING_OPTIONS
+            
+            elif first in 'Qq' and QUESTION_RE.match(line):
                 if current_question and self._is_valid_quiz(current_question):
-                    questions.append(current_question.copy())
+                    yield self._join_quiz_parts(current_question)
                 current_question = {}
-                reading_explanation = False
-                continue
+                state = READING_QUESTION
             
-            option_match = re.match(r'^([A-D])[\):]\s*(.+)$', line)
-            if option_match:
-                option_letter = option_match.group(1)
-                option_text = option_match.group(2).strip()
-                current_question[f'option_{option_letter.lower()}'] = option_text
-                reading_explanation = False
+            elif first in 'Cc' and (answer_match := CORRECT_ANSWER_RE.match(line)):
+                current_question['correct_answer'] = answer_match.group(1).upper()
+                state = READING_OPTIONS
             
-            elif re.match(r'^Correct Answer:?\s*([A-D])', line, re.IGNORECASE):
-                answer_match = re.search(r'([A-D])', line)
-                if answer_match:
-                    current_question['correct_answer'] = answer_match.group(1).upper()
-                reading_explanation = False
+            elif first in 'Ee' and line[:12].lower() == 'explanation:':
+                explanation = line[12:].strip()
+                current_question['explanation'] = [explanation] if explanation else []
+                state = READING_EXPLANATION
             
-            elif re.match(r'^Explanation:', line, re.IGNORECASE):
-                explanation = line.split(':', 1)[1].strip() if ':' in line else ""
-                current_question['explanation'] = explanation
-                reading_explanation = True
+            elif state == READING_EXPLANATION:
+                current_question['explanation'].append(line)
             
-            elif reading_explanation and current_question.get('explanation'):
-                current_question['explanation'] += " " + line
+            elif 'question' not in current_question:
+                if not line.startswith('**'):
+                    current_question['question'] = [line]
             
-            elif not current_question.get('question') and not line.startswith('**'):
-                current_question['question'] = line
-            elif current_question.get('question') and not any(key.startswith('option_') for key in current_question.keys()):
-                current_question['question'] += " " + line
+            elif state == READING_QUESTION:
+                current_question['question'].append(line)
         
         if current_question and self._is_valid_quiz(current_question):
-            questions.append(current_question.copy())
-        
-        return questions
+            yield self._join_quiz_parts(current_question)
+    
+    @staticmethod
+    def _join_quiz_parts(question: Dict) -> Dict:
+        """Join the collected question and explanation lines of a parsed question"""
+        joined = {**question, 'question': " ".join(question['question'])}
+        if 'explanation' in question:
+            joined['explanation'] = " ".join(question['explanation'])
+        return joined
     
     def _is_valid_quiz(self, quiz: Dict) -> bool:
         """Check if a quiz question has all required fields"""
@@ -1,77 +1,254 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Optional, List, Dict
-from database.models import Base, User, Course, Module, Subtopic, Quiz, UserProgress
-from datetime import datetime
+import re
+import hashlib
+from contextlib import contextmanager
+from sqlalchemy import create_engine, select, insert, update, func, case, text, inspect, Boolean
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url, Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker, Session, selectinload, make_transient_to_detached
+from typing import Iterator, Optional, List, Dict, Tuple
+from database.models import Base, User, Course, Module, Subtopic, Quiz, UserProgress, VideoCache, SchemaVersion, SCHEMA_VERSION, utcnow
+
+
+VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/)([\w-]{11})")
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+# Timestamps mirror the model defaults, which are all UTC
+COURSE_TREE_INSERT = text("""
+    WITH new_course AS (
+        INSERT INTO courses (user_id, title, created_at, updated_at)
+        VALUES (:user_id, :title, timezone('utc', now()), timezone('utc', now()))
+        RETURNING *
+    ), new_modules AS (
+        INSERT INTO modules (course_id, title, order_index, created_at)
+        SELECT new_course.id, m.title, m.order_index, timezone('utc', now())
+        FROM new_course,
+             unnest(CAST(:module_titles AS text[]), CAST(:module_orders AS integer[]))
+                 AS m(title, order_index)
+        RETURNING id, order_index
+    ), new_subtopics AS (
+        INSERT INTO subtopics (module_id, title, order_index, is_generated, created_at, updated_at)
+        SELECT new_modules.id, s.title, s.order_index, FALSE, timezone('utc', now()), timezone('utc', now())
+        FROM new_modules
+        JOIN unnest(CAST(:subtopic_modules AS integer[]), CAST(:subtopic_titles AS text[]),
+                    CAST(:subtopic_orders AS integer[]))
+                 AS s(module_order, title, order_index)
+             ON s.module_order = new_modules.order_index
+        RETURNING 1
+    )
+    SELECT new_course.*, (SELECT count(*) FROM new_subtopics) AS subtopic_count
+    FROM new_course
+""")
 
 
 class DatabaseService:
     """Service for managing database operations"""
     
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool_size: int = 20, max_overflow: int = 40):
         """Initialize database connection."""
         if database_url.startswith('postgresql://') and 'psycopg' not in database_url:
             database_url = database_url.replace('postgresql://', 'postgresql+psycopg://')
 
-        self.engine = create_engine(database_url)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        engine_options = {'echo': False, 'pool_pre_ping': True}
+        if make_url(database_url).get_backend_name() == 'postgresql':
+            # One engine is shared by every Streamlit session, so size the pool for
+            # concurrent reruns and skip JIT compilation, which only slows short queries
+            engine_options.update(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=300,
+                connect_args={'options': '-c jit=off'}
+            )
+
+        self.engine = create_engine(database_url, **engine_options)
+        # Objects stay readable after their session commits, since every method
+        # returns them detached to Streamlit code
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False,
+                                         expire_on_commit=False, bind=self.engine)
+
     def init_db(self):
-        """Initialize database tables"""
+        """Initialize database tables, skipping the DDL when the schema is already current"""
+        if self._get_schema_version() == SCHEMA_VERSION:
+            return
+
         Base.metadata.create_all(bind=self.engine)
+        self._add_missing_columns()
+        self._convert_boolean_columns()
+        self._create_missing_indexes()
+        self._set_schema_version(SCHEMA_VERSION)
         print("Database tables created successfully")
+
+    def _get_schema_version(self) -> Optional[int]:
+        """Get the recorded schema version, or None for a database that has not been versioned"""
+        with self.session_scope() as session:
+            try:
+                return session.scalar(select(SchemaVersion.version).limit(1))
+            except SQLAlchemyError:
+                session.rollback()
+                return None
+
+    def _set_schema_version(self, version: int):
+        """Record the schema version in the single schema_version row"""
+        with self.session_scope() as session:
+            row = session.scalar(select(SchemaVersion).limit(1))
+            if row:
+                row.version = version
+            else:
+                session.add(SchemaVersion(version=version))
+
+    def _add_missing_columns(self):
+        """Add nullable columns that were introduced after a table was first created"""
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(text(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                    ))
     
+    def _convert_boolean_columns(self):
+        """Convert flag columns created as INTEGER 0/1 to native BOOLEAN on Postgres"""
+        if self.engine.dialect.name != 'postgresql':
+            return
+
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name']: column['type'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if not isinstance(column.type, Boolean) or column.name not in existing:
+                        continue
+                    if isinstance(existing[column.name], Boolean):
+                        continue
+                    table_name = preparer.format_table(table)
+                    column_name = preparer.format_column(column)
+                    connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} DROP DEFAULT"))
+                    connection.execute(text(
+                        f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                        f"TYPE BOOLEAN USING COALESCE({column_name}, 0) <> 0"
+                    ))
+                    connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET DEFAULT FALSE"))
+                    connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET NOT NULL"))
+
+    def _create_missing_indexes(self):
+        """Create model indexes on tables that existed before the index was declared"""
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=connection, checkfirst=True)
+
+    def ping(self):
+        """Run a trivial query so a pooled connection is open before the first request"""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
     def get_session(self) -> Session:
         """Get a new database session"""
         return self.SessionLocal()
 
-    def get_or_create_user(self, username: str, email: Optional[str] = None) -> User:
-        """Get existing user or create a new one"""
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session that commits on success, rolls back on error and always closes"""
         session = self.get_session()
         try:
-            user = session.query(User).filter_by(username=username).first()
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_or_create_user(self, username: str, email: Optional[str] = None) -> User:
+        """
+        Get existing user or create a new one
+        
+        Where the database supports it, the insert is tried first with
+        ON CONFLICT DO NOTHING, so a new user costs one statement and
+        concurrent signups for the same username cannot create duplicates.
+        
+        Args:
+            username: Unique username
+            email: Email address, only used when the user is created
+            
+        Returns:
+            User object
+        """
+        upsert_insert = UPSERT_INSERTS.get(self.engine.dialect.name)
+        with self.session_scope() as session:
+            if upsert_insert is not None:
+                stmt = (
+                    upsert_insert(User)
+                    .values(username=username, email=email)
+                    .on_conflict_do_nothing(index_elements=['username'])
+                    .returning(User)
+                )
+                user = session.scalars(stmt).one_or_none()
+                if user:
+                    return user
+            
+            user = session.scalars(select(User).filter_by(username=username)).first()
             if not user:
                 user = User(username=username, email=email)
                 session.add(user)
-                session.commit()
-                session.refresh(user)
             return user
-        finally:
-            session.close()
 
     def create_course(self, user_id: int, title: str, description: Optional[str] = None) -> Course:
         """Create a new course"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             course = Course(user_id=user_id, title=title, description=description)
             session.add(course)
-            session.commit()
-            session.refresh(course)
             return course
-        finally:
-            session.close()
     
     def get_course_by_title(self, user_id: int, title: str) -> Optional[Course]:
         """Get a course by title for a specific user"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Course).filter_by(user_id=user_id, title=title).first()
-        finally:
-            session.close()
+    
+    def get_course_tree(self, course_id: int, with_quizzes: bool = True) -> Optional[Course]:
+        """
+        Get a course with its modules and subtopics (and optionally quizzes) loaded
+        
+        Uses one IN query per relationship level, so the whole tree costs at most
+        four queries regardless of how many modules and subtopics the course has.
+        
+        Args:
+            course_id: Course ID
+            with_quizzes: Also load each subtopic's quizzes (default: True)
+            
+        Returns:
+            Course object with modules, subtopics and quizzes populated, or None
+        """
+        subtopics_loader = selectinload(Course.modules).selectinload(Module.subtopics)
+        if with_quizzes:
+            subtopics_loader = subtopics_loader.selectinload(Subtopic.quizzes)
+        
+        with self.session_scope() as session:
+            return session.scalars(
+                select(Course)
+                .options(subtopics_loader)
+                .where(Course.id == course_id)
+            ).one_or_none()
     
     def get_user_courses(self, user_id: int) -> List[Course]:
         """Get all courses for a user"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Course).filter_by(user_id=user_id).all()
-        finally:
-            session.close()
 
     def create_module(self, course_id: int, title: str, description: Optional[str] = None, 
                      order_index: int = 0) -> Module:
         """Create a new module"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             module = Module(
                 course_id=course_id,
                 title=title,
@@ -79,87 +256,141 @@ class DatabaseService:
                 order_index=order_index
             )
             session.add(module)
-            session.commit()
-            session.refresh(module)
             return module
-        finally:
-            session.close()
     
     def get_course_modules(self, course_id: int) -> List[Module]:
         """Get all modules for a course, ordered by order_index"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Module).filter_by(course_id=course_id).order_by(Module.order_index).all()
-        finally:
-            session.close()
+    
+    def get_module(self, module_id: int) -> Optional[Module]:
+        """Get a module by ID"""
+        with self.session_scope() as session:
+            return session.get(Module, module_id)
+    
+    def get_course_progress(self, course_id: int) -> Tuple[int, int]:
+        """Get (total, generated) subtopic counts for a course in a single query"""
+        with self.session_scope() as session:
+            total, generated = session.query(
+                func.count(Subtopic.id),
+                func.sum(case((Subtopic.is_generated, 1), else_=0))
+            ).join(Module, Subtopic.module_id == Module.id).filter(Module.course_id == course_id).one()
+            return total or 0, generated or 0
 
     def create_subtopic(self, module_id: int, title: str, order_index: int = 0) -> Subtopic:
         """Create a new subtopic"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             subtopic = Subtopic(
                 module_id=module_id,
                 title=title,
                 order_index=order_index,
-                is_generated=0
+                is_generated=False
             )
             session.add(subtopic)
-            session.commit()
-            session.refresh(subtopic)
             return subtopic
-        finally:
-            session.close()
     
     def get_subtopic(self, subtopic_id: int) -> Optional[Subtopic]:
         """Get a subtopic by ID"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Subtopic).filter_by(id=subtopic_id).first()
-        finally:
-            session.close()
     
     def update_subtopic_content(self, subtopic_id: int, content: str, 
                                 youtube_keywords: Optional[str] = None,
                                 video_url: Optional[str] = None,
-                                video_title: Optional[str] = None):
-        """Update subtopic with generated content"""
-        session = self.get_session()
-        try:
-            subtopic = session.query(Subtopic).filter_by(id=subtopic_id).first()
-            if subtopic:
-                subtopic.content = content
-                subtopic.youtube_keywords = youtube_keywords
-                subtopic.video_url = video_url
-                subtopic.video_title = video_title
-                subtopic.is_generated = 1
-                subtopic.updated_at = datetime.utcnow()
-                session.commit()
-        finally:
-            session.close()
+                                video_title: Optional[str] = None,
+                                word_count: Optional[int] = None) -> bool:
+        """
+        Save generated content for a subtopic that has not been generated yet
+        
+        The check and the write are one conditional UPDATE, so when background
+        and on-demand generation race for the same subtopic exactly one wins.
+        
+        Args:
+            subtopic_id: Subtopic ID
+            content: Generated lesson content
+            youtube_keywords: Keywords used for the video search
+            video_url: Video URL
+            video_title: Video title
+            word_count: Number of words in the content
+            
+        Returns:
+            True if this call stored the content, False if the subtopic was already generated
+        """
+        with self.session_scope() as session:
+            result = session.execute(
+                update(Subtopic)
+                .where(Subtopic.id == subtopic_id, Subtopic.is_generated.is_(False))
+                .values(
+                    content=content,
+                    youtube_keywords=youtube_keywords,
+                    video_url=video_url,
+                    video_title=video_title,
+                    video_embed_url=self._video_embed_url(video_url),
+                    word_count=word_count,
+                    is_generated=True
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
+    
+    @staticmethod
+    def _video_embed_url(video_url: Optional[str]) -> Optional[str]:
+        """Build the YouTube embed URL for a watch or youtu.be link"""
+        if not video_url:
+            return None
+        match = VIDEO_ID_RE.search(video_url)
+        if not match:
+            return None
+        return f"https://www.youtube.com/embed/{match.group(1)}"
     
     def get_module_subtopics(self, module_id: int) -> List[Subtopic]:
         """Get all subtopics for a module, ordered by order_index"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Subtopic).filter_by(module_id=module_id).order_by(Subtopic.order_index).all()
-        finally:
-            session.close()
+    
+    def get_module_subtopics_light(self, module_id: int) -> List[Row]:
+        """
+        Get a module's subtopics as plain rows for list views, ordered by order_index
+        
+        Only the columns a listing needs are selected, and the rows skip ORM
+        instance construction. Use get_module_subtopics when the content is needed.
+        
+        Args:
+            module_id: Module ID
+            
+        Returns:
+            Rows with id, title, order_index and is_generated attributes
+        """
+        with self.session_scope() as session:
+            return session.execute(
+                select(Subtopic.id, Subtopic.title, Subtopic.order_index, Subtopic.is_generated)
+                .where(Subtopic.module_id == module_id)
+                .order_by(Subtopic.order_index)
+            ).all()
+    
+    def get_previous_subtopic_titles(self, module_id: int, order_index: int) -> List[str]:
+        """Get titles of the generated subtopics that come before a position in a module"""
+        with self.session_scope() as session:
+            return list(session.scalars(
+                select(Subtopic.title)
+                .where(
+                    Subtopic.module_id == module_id,
+                    Subtopic.order_index < order_index,
+                    Subtopic.is_generated
+                )
+                .order_by(Subtopic.order_index)
+            ))
     
     def is_subtopic_generated(self, subtopic_id: int) -> bool:
-        """Check if a subtopic has been generated"""
-        session = self.get_session()
-        try:
-            subtopic = session.query(Subtopic).filter_by(id=subtopic_id).first()
-            return subtopic.is_generated == 1 if subtopic else False
-        finally:
-            session.close()
+        """Check if a subtopic has been generated, reading only the flag column"""
+        with self.session_scope() as session:
+            return bool(session.scalar(select(Subtopic.is_generated).where(Subtopic.id == subtopic_id)))
 
     def create_quiz(self, subtopic_id: int, question: str, option_a: str, option_b: str,
                    option_c: str, option_d: str, correct_answer: str, 
                    explanation: Optional[str] = None, order_index: int = 0) -> Quiz:
         """Create a new quiz question"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             quiz = Quiz(
                 subtopic_id=subtopic_id,
                 question=question,
@@ -172,28 +403,36 @@ class DatabaseService:
                 order_index=order_index
             )
             session.add(quiz)
-            session.commit()
-            session.refresh(quiz)
             return quiz
-        finally:
-            session.close()
+    
+    def create_quizzes_bulk(self, subtopic_id: int, rows: List[Dict]) -> int:
+        """
+        Create several quiz questions for a subtopic in one INSERT and commit
+        
+        Args:
+            subtopic_id: Subtopic ID
+            rows: Quiz dictionaries with question, option_a..option_d,
+                  correct_answer, explanation and order_index keys
+            
+        Returns:
+            Number of quiz questions created
+        """
+        if not rows:
+            return 0
+        
+        with self.session_scope() as session:
+            session.execute(insert(Quiz), [{**row, 'subtopic_id': subtopic_id} for row in rows])
+            return len(rows)
     
     def get_subtopic_quizzes(self, subtopic_id: int) -> List[Quiz]:
         """Get all quizzes for a subtopic"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Quiz).filter_by(subtopic_id=subtopic_id).order_by(Quiz.order_index).all()
-        finally:
-            session.close()
     
     def delete_subtopic_quizzes(self, subtopic_id: int):
         """Delete all quizzes for a subtopic"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             session.query(Quiz).filter_by(subtopic_id=subtopic_id).delete()
-            session.commit()
-        finally:
-            session.close()
 
     def create_full_course(self, user_id: int, course_title: str, 
                           course_outline: Dict[str, List[str]]) -> Course:
@@ -208,70 +447,114 @@ class DatabaseService:
         Returns:
             Created Course object
         """
-        session = self.get_session()
-        try:
+        if self.engine.dialect.name == 'postgresql':
+            return self._create_full_course_postgres(user_id, course_title, course_outline)
+        
+        with self.session_scope() as session:
             course = Course(user_id=user_id, title=course_title)
             session.add(course)
             session.flush() 
         
-            module_order = 0
-            for module_title, subtopics in course_outline.items():
-                module = Module(
-                    course_id=course.id,
-                    title=module_title,
-                    order_index=module_order
-                )
-                session.add(module)
-                session.flush()
+            # One flush inserts every module and returns their IDs
+            modules = [
+                Module(course_id=course.id, title=module_title, order_index=module_order)
+                for module_order, module_title in enumerate(course_outline)
+            ]
+            session.add_all(modules)
+            session.flush()
             
-                for subtopic_order, subtopic_title in enumerate(subtopics):
-                    subtopic = Subtopic(
-                        module_id=module.id,
-                        title=subtopic_title,
-                        order_index=subtopic_order,
-                        is_generated=0
-                    )
-                    session.add(subtopic)
-                
-                module_order += 1
+            subtopic_rows = [
+                {
+                    'module_id': module.id,
+                    'title': subtopic_title,
+                    'order_index': subtopic_order,
+                    'is_generated': False
+                }
+                for module, subtopics in zip(modules, course_outline.values())
+                for subtopic_order, subtopic_title in enumerate(subtopics)
+            ]
+            if subtopic_rows:
+                session.execute(insert(Subtopic), subtopic_rows)
             
-            session.commit()
-            session.refresh(course)
             return course
-            
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+
+    def _create_full_course_postgres(self, user_id: int, course_title: str,
+                                     course_outline: Dict[str, List[str]]) -> Course:
+        """
+        Create a course with its modules and subtopics in a single Postgres statement
+        
+        Chained data-modifying CTEs insert the course, then the modules, then the
+        subtopics (matched to their module by order_index), so the whole tree costs
+        one round trip plus the commit instead of one per INSERT.
+        """
+        subtopic_modules = []
+        subtopic_titles = []
+        subtopic_orders = []
+        for module_order, subtopics in enumerate(course_outline.values()):
+            for subtopic_order, subtopic_title in enumerate(subtopics):
+                subtopic_modules.append(module_order)
+                subtopic_titles.append(subtopic_title)
+                subtopic_orders.append(subtopic_order)
+        
+        with self.session_scope() as session:
+            row = session.execute(COURSE_TREE_INSERT, {
+                'user_id': user_id,
+                'title': course_title,
+                'module_titles': list(course_outline),
+                'module_orders': list(range(len(course_outline))),
+                'subtopic_modules': subtopic_modules,
+                'subtopic_titles': subtopic_titles,
+                'subtopic_orders': subtopic_orders
+            }).one()
+        
+        course = Course(**{column.key: row._mapping[column.name] for column in Course.__table__.columns})
+        # Mark it as a loaded row, so relationship access raises instead of returning empty lists
+        make_transient_to_detached(course)
+        return course
 
     def save_quiz_progress(self, user_id: int, subtopic_id: int, quiz_id: int, 
                           score: float, completed: bool = True):
         """Save user's quiz progress"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             progress = UserProgress(
                 user_id=user_id,
                 subtopic_id=subtopic_id,
                 quiz_id=quiz_id,
                 score=score,
-                completed=1 if completed else 0
+                completed=completed
             )
             session.add(progress)
-            session.commit()
-        finally:
-            session.close()
     
     def get_user_progress(self, user_id: int, subtopic_id: int) -> Optional[UserProgress]:
         """Get user's progress for a subtopic"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(UserProgress).filter_by(
                 user_id=user_id, 
                 subtopic_id=subtopic_id
             ).first()
-        finally:
-            session.close()
+
+    def _keywords_hash(self, keywords: str) -> str:
+        """Normalize search keywords and hash them into a cache key"""
+        return hashlib.sha256(keywords.strip().lower().encode('utf-8')).hexdigest()
+
+    def get_cached_video(self, keywords: str) -> Optional[Dict]:
+        """Get a previously found video for the given search keywords"""
+        with self.session_scope() as session:
+            cached = session.get(VideoCache, self._keywords_hash(keywords))
+            if cached:
+                return {'url': cached.video_url, 'title': cached.video_title}
+            return None
+
+    def save_cached_video(self, keywords: str, video_url: str, video_title: Optional[str] = None):
+        """Store the video found for the given search keywords"""
+        with self.session_scope() as session:
+            session.merge(VideoCache(
+                keywords_hash=self._keywords_hash(keywords),
+                keywords=keywords,
+                video_url=video_url,
+                video_title=video_title,
+                fetched_at=utcnow()
+            ))
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -308,10 +591,9 @@ if __name__ == "__main__":
     course = db_service.create_full_course(user.id, "Python Basics", course_outline)
     print(f"Course created: {course.title}")
 
-    modules = db_service.get_course_modules(course.id)
-    print(f"\nModules created: {len(modules)}")
-    for module in modules:
+    course_tree = db_service.get_course_tree(course.id, with_quizzes=False)
+    print(f"\nModules created: {len(course_tree.modules)}")
+    for module in course_tree.modules:
         print(f"  - {module.title}")
-        subtopics = db_service.get_module_subtopics(module.id)
-        for subtopic in subtopics:
+        for subtopic in module.subtopics:
             print(f"    • {subtopic.title}")
@@ -1,16 +1,50 @@
 import os
+import asyncio
+import heapq
+import threading
+import httpx
+import httplib2
+import numpy as np
 from googleapiclient.discovery import build
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Set
 import re
 
 
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+EDUCATIONAL_KEYWORDS = frozenset({'tutorial', 'guide', 'course', 'explained',
+                                  'learn', 'introduction', 'beginner', 'complete'})
+TITLE_WORD_RE = re.compile(r'\w+')
+# Search results whose statistics are fetched, after ranking on title alone
+SNIPPET_SHORTLIST_SIZE = 3
+# videos.list projection: the snippet already came with the search results
+VIDEO_STATS_PART = 'statistics,contentDetails'
+VIDEO_STATS_FIELDS = 'items(id,statistics(viewCount,likeCount),contentDetails/duration)'
+
+
 class YouTubeService:
     """Service for fetching relevant YouTube tutorial videos"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, request_timeout: float = 3.0, max_retries: int = 2):
         """Initialize YouTube API client"""
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self._local = threading.local()
+    
+    @property
+    def youtube(self):
+        """YouTube API client for the current thread (httplib2 connections are not thread-safe)"""
+        client = getattr(self._local, 'youtube', None)
+        if client is None:
+            client = build(
+                'youtube', 'v3',
+                developerKey=self.api_key,
+                http=httplib2.Http(timeout=self.request_timeout),
+                cache_discovery=False
+            )
+            self._local.youtube = client
+        return client
     
     def search_best_video(self, keywords: str, max_results: int = 10) -> Optional[Dict]:
         """
@@ -26,42 +60,21 @@ class YouTubeService:
         try:
             search_query = keywords.split(',')[0].strip()
             
-            search_response = self.youtube.search().list(
-                q=search_query,
-                part='id,snippet',
-                maxResults=max_results,
-                type='video',
-                order='relevance',  
-                videoDuration='medium',  
-                videoDefinition='any',
-                relevanceLanguage='en'
-            ).execute()
-            
-            if not search_response.get('items'):
+            shortlist = self._shortlist_by_snippet(self._search_items(search_query, max_results), search_query)
+            if not shortlist:
                 return None
             
-            video_ids = [item['id']['videoId'] for item in search_response['items']]
-            
             videos_response = self.youtube.videos().list(
-                part='statistics,snippet,contentDetails',
-                id=','.join(video_ids)
-            ).execute()
+                part=VIDEO_STATS_PART,
+                id=','.join(shortlist),
+                fields=VIDEO_STATS_FIELDS
+            ).execute(num_retries=self.max_retries)
             
-            if not videos_response.get('items'):
-                return None
-            
-            best_video = self._select_best_video(videos_response['items'], search_query)
+            videos = {item['id']: item for item in videos_response.get('items', [])}
+            best_video = self._select_best_video(self._with_snippets(videos, shortlist), search_query)
             
             if best_video:
-                return {
-                    'url': f"https://www.youtube.com/watch?v={best_video['id']}",
-                    'title': best_video['snippet']['title'],
-                    'description': best_video['snippet']['description'],
-                    'thumbnail': best_video['snippet']['thumbnails']['high']['url'],
-                    'views': int(best_video['statistics'].get('viewCount', 0)),
-                    'likes': int(best_video['statistics'].get('likeCount', 0)),
-                    'channel': best_video['snippet']['channelTitle']
-                }
+                return self._video_details(best_video)
             
             return None
             
@@ -69,6 +82,207 @@ class YouTubeService:
             print(f"YouTube API Error: {str(e)}")
             return None
     
+    def search_best_videos_bulk(self, keyword_list: List[str], max_results: int = 10,
+                                concurrency: int = 5) -> Dict[str, Optional[Dict]]:
+        """
+        Search for the best tutorial video for several keyword strings at once
+        
+        Synchronous wrapper around asearch_best_videos for callers without a
+        running event loop, such as the background pregeneration threads.
+        
+        Args:
+            keyword_list: Search keywords, one entry per video wanted
+            max_results: Maximum number of results to fetch per search (default: 10)
+            concurrency: Maximum number of searches in flight (default: 5)
+            
+        Returns:
+            Dictionary mapping each keywords entry to its video details or None
+        """
+        return asyncio.run(self.asearch_best_videos(keyword_list, max_results, concurrency))
+    
+    async def asearch_best_video(self, keywords: str, max_results: int = 10) -> Optional[Dict]:
+        """Async version of search_best_video, calling the YouTube Data API over REST"""
+        results = await self.asearch_best_videos([keywords], max_results)
+        return results[keywords]
+    
+    async def asearch_best_videos(self, keyword_list: List[str], max_results: int = 10,
+                                  concurrency: int = 5) -> Dict[str, Optional[Dict]]:
+        """
+        Search for the best tutorial video for several keyword strings concurrently
+        
+        The search.list calls are awaited together, bounded by concurrency, and the
+        statistics of every shortlisted candidate are fetched with shared videos.list
+        calls (up to 50 ids each), so a whole module resolves in about two round trips.
+        
+        Args:
+            keyword_list: Search keywords, one entry per video wanted
+            max_results: Maximum number of results to fetch per search (default: 10)
+            concurrency: Maximum number of searches in flight (default: 5)
+            
+        Returns:
+            Dictionary mapping each keywords entry to its video details or None
+        """
+        keyword_list = list(dict.fromkeys(keyword_list))
+        results = {keywords: None for keywords in keyword_list}
+        if not keyword_list:
+            return results
+        
+        queries = {keywords: keywords.split(',')[0].strip() for keywords in keyword_list}
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def search(client: httpx.AsyncClient, keywords: str) -> Dict[str, Dict]:
+            # A failed search only loses the video for its own keywords
+            async with semaphore:
+                try:
+                    items = await self._asearch_items(client, queries[keywords], max_results)
+                except Exception as e:
+                    print(f"YouTube API Error: {self._describe_error(e)}")
+                    return {}
+            return self._shortlist_by_snippet(items, queries[keywords])
+        
+        try:
+            async with httpx.AsyncClient(
+                timeout=self.request_timeout,
+                transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+            ) as client:
+                shortlists = dict(zip(
+                    keyword_list,
+                    await asyncio.gather(*[search(client, keywords) for keywords in keyword_list])
+                ))
+                
+                video_ids = list(dict.fromkeys(
+                    video_id for shortlist in shortlists.values() for video_id in shortlist
+                ))
+                videos = {}
+                for items in await asyncio.gather(*[
+                    self._aget_videos(client, video_ids[start:start + 50])
+                    for start in range(0, len(video_ids), 50)
+                ]):
+                    for item in items:
+                        videos[item['id']] = item
+            
+            for keywords, shortlist in shortlists.items():
+                best_video = self._select_best_video(self._with_snippets(videos, shortlist), queries[keywords])
+                if best_video:
+                    results[keywords] = self._video_details(best_video)
+            
+        except Exception as e:
+            print(f"YouTube API Error: {self._describe_error(e)}")
+        
+        return results
+    
+    def _describe_error(self, error: Exception) -> str:
+        """Describe a REST call failure without echoing the request URL, which carries the API key"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return f"HTTP {error.response.status_code} from {error.request.url.path}"
+        if isinstance(error, httpx.RequestError):
+            return f"{error.__class__.__name__} for {error.request.url.path}"
+        return str(error)
+    
+    def _search_params(self, search_query: str, max_results: int) -> Dict:
+        """Query parameters shared by the sync and async search.list calls"""
+        return {
+            'q': search_query,
+            'part': 'id,snippet',
+            'maxResults': max_results,
+            'type': 'video',
+            'order': 'relevance',
+            'videoDuration': 'medium',
+            'videoDefinition': 'any',
+            'relevanceLanguage': 'en'
+        }
+    
+    def _search_items(self, search_query: str, max_results: int) -> List[Dict]:
+        """Run a search.list query and return the matching items with their snippets"""
+        search_response = self.youtube.search().list(
+            **self._search_params(search_query, max_results)
+        ).execute(num_retries=self.max_retries)
+        
+        return search_response.get('items', [])
+    
+    async def _asearch_items(self, client: httpx.AsyncClient, search_query: str,
+                             max_results: int) -> List[Dict]:
+        """Run a search.list query over REST and return the matching items with their snippets"""
+        response = await client.get(
+            f"{YOUTUBE_API_URL}/search",
+            params={**self._search_params(search_query, max_results), 'key': self.api_key}
+        )
+        response.raise_for_status()
+        return response.json().get('items', [])
+    
+    async def _aget_videos(self, client: httpx.AsyncClient, video_ids: List[str]) -> List[Dict]:
+        """Fetch view counts, like counts and duration for up to 50 videos over REST"""
+        response = await client.get(
+            f"{YOUTUBE_API_URL}/videos",
+            params={
+                'part': VIDEO_STATS_PART,
+                'id': ','.join(video_ids),
+                'fields': VIDEO_STATS_FIELDS,
+                'key': self.api_key
+            }
+        )
+        response.raise_for_status()
+        return response.json().get('items', [])
+    
+    def _shortlist_by_snippet(self, search_items: List[Dict], search_query: str) -> Dict[str, Dict]:
+        """
+        Rank search results on their snippet title and keep the best few
+        
+        Args:
+            search_items: Items returned by search.list
+            search_query: Original search query for relevance scoring
+            
+        Returns:
+            Dictionary mapping video id to snippet for the shortlisted results, best first
+        """
+        query_words = set(TITLE_WORD_RE.findall(search_query.lower()))
+        scored = []
+        for item in search_items:
+            try:
+                scored.append((
+                    self._title_score(item['snippet']['title'].lower(), query_words),
+                    item['id']['videoId'],
+                    item['snippet']
+                ))
+            except (KeyError, TypeError):
+                continue
+        
+        # nlargest is stable, so equal scores keep the search relevance order
+        best = heapq.nlargest(SNIPPET_SHORTLIST_SIZE, scored, key=lambda entry: entry[0])
+        return {video_id: snippet for _, video_id, snippet in best}
+    
+    def _with_snippets(self, videos: Dict[str, Dict], shortlist: Dict[str, Dict]) -> List[Dict]:
+        """Combine videos.list statistics with the snippets from search.list, in shortlist order"""
+        return [
+            {**videos[video_id], 'snippet': snippet}
+            for video_id, snippet in shortlist.items()
+            if video_id in videos
+        ]
+    
+    @staticmethod
+    def _title_words(text: str) -> Set[str]:
+        """Split a lowercased title into its set of words, with plurals also folded to singular"""
+        words = set(TITLE_WORD_RE.findall(text))
+        words.update([word[:-1] for word in words if len(word) > 3 and word.endswith('s')])
+        return words
+    
+    def _title_score(self, title: str, query_words: Set[str]) -> int:
+        """Score a lowercased title on query word and educational keyword matches"""
+        title_words = self._title_words(title)
+        return len(query_words & title_words) * 10 + len(EDUCATIONAL_KEYWORDS & title_words) * 5
+    
+    def _video_details(self, video: Dict) -> Dict:
+        """Extract the fields the app uses from a videos.list item"""
+        return {
+            'url': f"https://www.youtube.com/watch?v={video['id']}",
+            'title': video['snippet']['title'],
+            'description': video['snippet']['description'],
+            'thumbnail': video['snippet']['thumbnails']['high']['url'],
+            'views': int(video['statistics'].get('viewCount', 0)),
+            'likes': int(video['statistics'].get('likeCount', 0)),
+            'channel': video['snippet']['channelTitle']
+        }
+    
     def _select_best_video(self, videos: list, search_query: str) -> Optional[Dict]:
         """
         Select the best video from a list based on multiple criteria
@@ -83,51 +297,43 @@ class YouTubeService:
         if not videos:
             return None
         
-        scored_videos = []
+        query_words = set(TITLE_WORD_RE.findall(search_query.lower()))
         
+        # Gather each scoring input into its own array, skipping malformed items
+        candidates = []
+        views = []
+        likes = []
+        durations = []
+        title_scores = []
         for video in videos:
             try:
-                views = int(video['statistics'].get('viewCount', 0))
-                likes = int(video['statistics'].get('likeCount', 0))
+                video_views = int(video['statistics'].get('viewCount', 0))
+                video_likes = int(video['statistics'].get('likeCount', 0))
                 title = video['snippet']['title'].lower()
-                description = video['snippet']['description'].lower()
-                
-                score = 0
-                
-                if views > 0:
-                    score += min(views / 100000, 50) 
-                
-                if views > 0:
-                    like_ratio = likes / views
-                    score += like_ratio * 100  
-                
-                query_words = search_query.lower().split()
-                title_matches = sum(1 for word in query_words if word in title)
-                score += title_matches * 10
-                
-                educational_keywords = ['tutorial', 'guide', 'course', 'explained', 
-                                        'learn', 'introduction', 'beginner', 'complete']
-                title_edu_matches = sum(1 for keyword in educational_keywords if keyword in title)
-                score += title_edu_matches * 5
-                
-                duration = video['contentDetails'].get('duration', '')
-                duration_seconds = self._parse_duration(duration)
-                if duration_seconds < 120 or duration_seconds > 3600:  
-                    score -= 10
-                
-                scored_videos.append({
-                    'video': video,
-                    'score': score
-                })
-                
-            except Exception as e:
+                duration = self._parse_duration(video['contentDetails'].get('duration', ''))
+            except Exception:
                 continue
+            
+            candidates.append(video)
+            views.append(video_views)
+            likes.append(video_likes)
+            durations.append(duration)
+            title_scores.append(self._title_score(title, query_words))
+        
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
         
-        if scored_videos:
-            scored_videos.sort(key=lambda x: x['score'], reverse=True)
-            return scored_videos[0]['video']
+        views = np.array(views, dtype=np.float64)
+        likes = np.array(likes, dtype=np.float64)
+        durations = np.array(durations, dtype=np.int64)
         
-        return None
+        score = np.minimum(views / 100000, 50)
+        score += np.where(views > 0, likes / np.maximum(views, 1) * 100, 0)
+        score += np.array(title_scores)
+        score -= np.where((durations < 120) | (durations > 3600), 10, 0)
+        
+        # argmax keeps the first of equal scores, like the stable sort it replaces
+        return candidates[int(score.argmax())]
     
     def _parse_duration(self, duration: str) -> int:
         """
@@ -139,28 +345,12 @@ class YouTubeService:
         Returns:
             Duration in seconds
         """
-        try:
-            duration = duration.replace('PT', '')
-            
-            hours = 0
-            minutes = 0
-            seconds = 0
-            
-            if 'H' in duration:
-                hours = int(duration.split('H')[0])
-                duration = duration.split('H')[1]
-            
-            if 'M' in duration:
-                minutes = int(duration.split('M')[0])
-                duration = duration.split('M')[1]
-            
-            if 'S' in duration:
-                seconds = int(duration.replace('S', ''))
-            
-            return hours * 3600 + minutes * 60 + seconds
-            
-        except Exception:
+        match = DURATION_RE.match(duration or '')
+        if not match:
             return 0
+        
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
     
     def get_video_embed_url(self, video_url: str) -> str:
         """
@@ -10,8 +10,11 @@ from .prompt_helpers import (
 )
 
 from .quiz_generator import (
+    QuizResult,
     shuffle_quiz_options,
     calculate_quiz_score,
+    calculate_quiz_scores_batch,
+    encode_answer_letters,
     generate_quiz_feedback,
     format_quiz_result,
     validate_quiz_structure
@@ -26,8 +29,11 @@ __all__ = [
     'create_progress_summary',
     'sanitize_filename',
     'estimate_reading_time',
+    'QuizResult',
     'shuffle_quiz_options',
     'calculate_quiz_score',
+    'calculate_quiz_scores_batch',
+    'encode_answer_letters',
     'generate_quiz_feedback',
     'format_quiz_result',
     'validate_quiz_structure'
@@ -2,8 +2,29 @@
 Helper functions for working with AI prompts and responses
 """
 import re
+from collections import Counter
 from typing import Dict, List, Optional
 
+
+WHITESPACE_RE = re.compile(r'\s+')
+FENCE_RE = re.compile(r'```(\w*)\s*$')
+# Drops characters that are invalid in filenames and turns spaces into underscores
+FILENAME_TRANSLATION = str.maketrans({**dict.fromkeys('<>:"/\\|?*'), ' ': '_'})
+TOPIC_WORD_RE = re.compile(r'\b[a-z]+\b')
+WORD_COUNT_RE = re.compile(r'\S+')
+# Ten-segment progress bars, indexed by completed tenths
+PROGRESS_BARS = tuple('█' * filled + '░' * (10 - filled) for filled in range(11))
+COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with', 'is', 'are', 'was', 'were', 'be', 'been',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'can', 'this',
+    'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it',
+    'we', 'they', 'what', 'which', 'who', 'when', 'where',
+    'why', 'how'
+})
+
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize text output from AI
@@ -14,7 +35,7 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text
     """
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     
     text = text.strip()
     
@@ -32,17 +53,34 @@ def extract_code_blocks(text: str) -> List[Dict[str, str]]:
         List of dictionaries with 'language' and 'code' keys
     """
     code_blocks = []
-    
-    pattern = r'```(\w+)?\n(.*?)```'
-    matches = re.findall(pattern, text, re.DOTALL)
-    
-    for match in matches:
-        language = match[0] if match[0] else 'text'
-        code = match[1].strip()
-        code_blocks.append({
-            'language': language,
-            'code': code
-        })
+    language = None
+    indent = 0
+    code_lines = []
+    
+    # Scan line by line so only fence lines are matched against a pattern.
+    # Fences may be indented, e.g. inside list items; the opening fence's
+    # indentation is removed from the block's lines.
+    for line in text.splitlines():
+        stripped = line.lstrip()
+        if not stripped.startswith('```'):
+            if language is not None:
+                code_lines.append(line[indent:] if not line[:indent].strip() else stripped)
+            continue
+        
+        fence = FENCE_RE.match(stripped)
+        if language is None:
+            if fence:
+                language = fence.group(1) or 'text'
+                indent = len(line) - len(stripped)
+                code_lines = []
+        elif fence and not fence.group(1):
+            code_blocks.append({
+                'language': language,
+                'code': '\n'.join(code_lines).strip()
+            })
+            language = None
+        else:
+            code_lines.append(line[indent:] if not line[:indent].strip() else stripped)
     
     return code_blocks
 
@@ -57,22 +95,26 @@ def format_quiz_for_display(quiz_data: List[Dict]) -> str:
     Returns:
         Formatted string for display
     """
-    formatted = ""
+    parts = []
     
     for i, question in enumerate(quiz_data, 1):
-        formatted += f"\n**Question {i}:** {question.get('question', '')}\n\n"
-        formatted += f"A) {question.get('option_a', '')}\n"
-        formatted += f"B) {question.get('option_b', '')}\n"
-        formatted += f"C) {question.get('option_c', '')}\n"
-        formatted += f"D) {question.get('option_d', '')}\n\n"
-        formatted += f"**Correct Answer:** {question.get('correct_answer', '')}\n"
+        get = question.get
+        parts.append(
+            f"\n**Question {i}:** {get('question', '')}\n\n"
+            f"A) {get('option_a', '')}\n"
+            f"B) {get('option_b', '')}\n"
+            f"C) {get('option_c', '')}\n"
+            f"D) {get('option_d', '')}\n\n"
+            f"**Correct Answer:** {get('correct_answer', '')}\n"
+        )
         
-        if question.get('explanation'):
-            formatted += f"**Explanation:** {question.get('explanation', '')}\n"
+        explanation = get('explanation')
+        if explanation:
+            parts.append(f"**Explanation:** {explanation}\n")
         
-        formatted += "\n---\n"
+        parts.append("\n---\n")
     
-    return formatted
+    return "".join(parts)
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
@@ -90,7 +132,7 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
     
-    return text[:max_length - len(suffix)].strip() + suffix
+    return f"{text[:max_length - len(suffix)].rstrip()}{suffix}"
 
 
 def validate_course_outline(outline: Dict[str, List[str]]) -> bool:
@@ -109,18 +151,12 @@ def validate_course_outline(outline: Dict[str, List[str]]) -> bool:
     if len(outline) < 3 or len(outline) > 10:
         return False
     
-    for module_title, subtopics in outline.items():
-        if not isinstance(module_title, str) or not module_title:
-            return False
-        
-        if not isinstance(subtopics, list) or len(subtopics) < 2:
-            return False
-        
-        for subtopic in subtopics:
-            if not isinstance(subtopic, str) or not subtopic:
-                return False
-    
-    return True
+    return all(
+        isinstance(module_title, str) and module_title
+        and isinstance(subtopics, list) and len(subtopics) >= 2
+        and all(isinstance(subtopic, str) and subtopic for subtopic in subtopics)
+        for module_title, subtopics in outline.items()
+    )
 
 
 def create_progress_summary(completed: int, total: int) -> Dict[str, any]:
@@ -141,7 +177,7 @@ def create_progress_summary(completed: int, total: int) -> Dict[str, any]:
         'total': total,
         'remaining': total - completed,
         'percentage': round(percentage, 1),
-        'progress_bar': f"{'█' * int(percentage / 10)}{'░' * (10 - int(percentage / 10))}"
+        'progress_bar': PROGRESS_BARS[min(10, max(0, int(percentage // 10)))]
     }
 
 
@@ -155,9 +191,7 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    
-    filename = filename.replace(' ', '_')
+    filename = filename.translate(FILENAME_TRANSLATION)
     
     max_length = 100
     if len(filename) > max_length:
@@ -177,7 +211,7 @@ def estimate_reading_time(text: str, words_per_minute: int = 200) -> int:
     Returns:
         Estimated reading time in minutes
     """
-    word_count = len(text.split())
+    word_count = sum(1 for _ in WORD_COUNT_RE.finditer(text))
     minutes = word_count / words_per_minute
     
     return max(1, round(minutes))
@@ -194,24 +228,11 @@ def extract_key_topics(text: str, num_topics: int = 5) -> List[str]:
     Returns:
         List of key topics
     """
-    common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 
-                   'for', 'of', 'with', 'is', 'are', 'was', 'were', 'be', 'been',
-                   'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 
-                   'could', 'should', 'may', 'might', 'must', 'can', 'this', 
-                   'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 
-                   'we', 'they', 'what', 'which', 'who', 'when', 'where', 
-                   'why', 'how'}
-    
-    words = re.findall(r'\b[a-z]+\b', text.lower())
-    
-    word_freq = {}
-    for word in words:
-        if word not in common_words and len(word) > 3:
-            word_freq[word] = word_freq.get(word, 0) + 1
+    words = TOPIC_WORD_RE.findall(text.lower())
     
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    word_freq = Counter(word for word in words if len(word) > 3 and word not in COMMON_WORDS)
     
-    return [word for word, freq in sorted_words[:num_topics]]
+    return [word for word, freq in word_freq.most_common(num_topics)]
 
 
 if __name__ == "__main__":
@@ -1,11 +1,25 @@
 """
 Utility functions for quiz generation and evaluation
 """
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 import random
+import re
+import numpy as np
 
 
-def shuffle_quiz_options(quiz: Dict) -> Dict:
+# A quiz question as stored and passed around the app; optional fields such as
+# 'explanation' may be None
+QuizDict = Mapping[str, Optional[str]]
+
+ANSWER_LETTERS = frozenset({'A', 'B', 'C', 'D'})
+REQUIRED_QUIZ_FIELDS = ('question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer')
+# Below this many attempts plain Python beats the cost of building an array
+NUMPY_STATS_MIN_RESULTS = 32
+COMPLEX_KEYWORD_RE = re.compile(r'analyze|evaluate|compare|contrast|why|explain', re.IGNORECASE)
+
+
+def shuffle_quiz_options(quiz: QuizDict) -> Dict[str, Optional[str]]:
     """
     Shuffle quiz options while maintaining the correct answer
     
@@ -15,34 +29,36 @@ def shuffle_quiz_options(quiz: Dict) -> Dict:
     Returns:
         Quiz with shuffled options
     """
-    options = {
-        'A': quiz.get('option_a', ''),
-        'B': quiz.get('option_b', ''),
-        'C': quiz.get('option_c', ''),
-        'D': quiz.get('option_d', '')
-    }
+    option_texts = [
+        quiz.get('option_a', ''),
+        quiz.get('option_b', ''),
+        quiz.get('option_c', ''),
+        quiz.get('option_d', '')
+    ]
     
     correct_answer = quiz.get('correct_answer', 'A')
-    correct_text = options.get(correct_answer, '')
+    if correct_answer in ANSWER_LETTERS:
+        correct_text = option_texts[ord(correct_answer) - ord('A')]
+    else:
+        correct_text = ''
     
-    option_texts = list(options.values())
     random.shuffle(option_texts)
     
-    new_quiz = quiz.copy()
-    new_quiz['option_a'] = option_texts[0]
-    new_quiz['option_b'] = option_texts[1]
-    new_quiz['option_c'] = option_texts[2]
-    new_quiz['option_d'] = option_texts[3]
+    new_quiz = {
+        **quiz,
+        'option_a': option_texts[0],
+        'option_b': option_texts[1],
+        'option_c': option_texts[2],
+        'option_d': option_texts[3]
+    }
     
-    for letter, text in zip(['A', 'B', 'C', 'D'], option_texts):
-        if text == correct_text:
-            new_quiz['correct_answer'] = letter
-            break
+    if correct_text in option_texts:
+        new_quiz['correct_answer'] = 'ABCD'[option_texts.index(correct_text)]
     
     return new_quiz
 
 
-def calculate_quiz_score(answers: Dict[int, str], quizzes: List[Dict]) -> Dict:
+def calculate_quiz_score(answers: Dict[int, str], quizzes: Sequence[QuizDict]) -> Dict[str, Union[int, float]]:
     """
     Calculate quiz score based on user answers
     
@@ -62,15 +78,13 @@ def calculate_quiz_score(answers: Dict[int, str], quizzes: List[Dict]) -> Dict:
             'incorrect': 0
         }
     
-    correct = 0
     total = len(quizzes)
     
-    for i, quiz in enumerate(quizzes):
-        user_answer = answers.get(i, '').upper()
-        correct_answer = quiz.get('correct_answer', '').upper()
-        
-        if user_answer == correct_answer:
-            correct += 1
+    get_answer = answers.get
+    correct = sum(
+        1 for i, quiz in enumerate(quizzes)
+        if get_answer(i, '').upper() == (quiz.get('correct_answer') or '').upper()
+    )
     
     percentage = (correct / total * 100) if total > 0 else 0
     
@@ -83,7 +97,34 @@ def calculate_quiz_score(answers: Dict[int, str], quizzes: List[Dict]) -> Dict:
     }
 
 
-def generate_quiz_feedback(score_data: Dict) -> str:
+def encode_answer_letters(letters: str) -> np.ndarray:
+    """
+    Encode a string of answer letters as answer codes (A=0 .. D=3)
+    
+    Args:
+        letters: One letter per question, e.g. "ACDB"; any other character marks an unanswered question
+        
+    Returns:
+        uint8 array of answer codes
+    """
+    return np.frombuffer(letters.upper().encode('ascii'), dtype=np.uint8) - ord('A')
+
+
+def calculate_quiz_scores_batch(answers_matrix: np.ndarray, correct_vector: np.ndarray) -> np.ndarray:
+    """
+    Score many quiz attempts at once
+    
+    Args:
+        answers_matrix: Answer codes with one row per attempt and one column per question
+        correct_vector: Correct answer codes, one per question
+        
+    Returns:
+        Number of correct answers for each attempt
+    """
+    return (answers_matrix == correct_vector).sum(axis=1)
+
+
+def generate_quiz_feedback(score_data: Dict[str, Union[int, float]]) -> str:
     """
     Generate encouraging feedback based on quiz score
     
@@ -107,7 +148,22 @@ def generate_quiz_feedback(score_data: Dict) -> str:
         return "Don't give up! Review the content and try again."
 
 
-def format_quiz_result(quiz: Dict, user_answer: str, show_explanation: bool = True) -> Dict:
+@dataclass(slots=True)
+class QuizResult:
+    """A user's answer to one quiz question, ready for display"""
+    question: str
+    user_answer: str
+    correct_answer: str
+    is_correct: bool
+    options: Tuple[str, str, str, str]
+    explanation: Optional[str] = None
+    
+    def option(self, letter: str) -> str:
+        """Get the option text for an answer letter (A-D)"""
+        return self.options[ord(letter.upper()) - ord('A')]
+
+
+def format_quiz_result(quiz: QuizDict, user_answer: str, show_explanation: bool = True) -> QuizResult:
     """
     Format quiz result for display
     
@@ -117,32 +173,27 @@ def format_quiz_result(quiz: Dict, user_answer: str, show_explanation: bool = Tr
         show_explanation: Whether to include explanation
         
     Returns:
-        Formatted result dictionary
+        QuizResult for the question
     """
-    correct_answer = quiz.get('correct_answer', '').upper()
+    correct_answer = (quiz.get('correct_answer') or '').upper()
     user_answer = user_answer.upper()
-    is_correct = user_answer == correct_answer
-    
-    result = {
-        'question': quiz.get('question', ''),
-        'user_answer': user_answer,
-        'correct_answer': correct_answer,
-        'is_correct': is_correct,
-        'options': {
-            'A': quiz.get('option_a', ''),
-            'B': quiz.get('option_b', ''),
-            'C': quiz.get('option_c', ''),
-            'D': quiz.get('option_d', '')
-        }
-    }
-    
-    if show_explanation and quiz.get('explanation'):
-        result['explanation'] = quiz.get('explanation', '')
     
-    return result
+    return QuizResult(
+        question=quiz.get('question') or '',
+        user_answer=user_answer,
+        correct_answer=correct_answer,
+        is_correct=user_answer == correct_answer,
+        options=(
+            quiz.get('option_a') or '',
+            quiz.get('option_b') or '',
+            quiz.get('option_c') or '',
+            quiz.get('option_d') or ''
+        ),
+        explanation=(quiz.get('explanation') or None) if show_explanation else None
+    )
 
 
-def get_quiz_difficulty(quiz: Dict) -> str:
+def get_quiz_difficulty(quiz: QuizDict) -> str:
     """
     Estimate quiz difficulty based on question characteristics
     
@@ -152,14 +203,13 @@ def get_quiz_difficulty(quiz: Dict) -> str:
     Returns:
         Difficulty level: 'easy', 'medium', or 'hard'
     """
-    question = quiz.get('question', '')
+    question = quiz.get('question') or ''
     
     word_count = len(question.split())
+    if word_count > 20:
+        return 'hard'
     
-    complex_keywords = ['analyze', 'evaluate', 'compare', 'contrast', 'why', 'explain']
-    has_complex_keyword = any(keyword in question.lower() for keyword in complex_keywords)
-    
-    if word_count > 20 or has_complex_keyword:
+    if COMPLEX_KEYWORD_RE.search(question):
         return 'hard'
     elif word_count > 12:
         return 'medium'
@@ -167,7 +217,7 @@ def get_quiz_difficulty(quiz: Dict) -> str:
         return 'easy'
 
 
-def validate_quiz_structure(quiz: Dict) -> bool:
+def validate_quiz_structure(quiz: QuizDict) -> bool:
     """
     Validate that a quiz has all required fields
     
@@ -177,19 +227,14 @@ def validate_quiz_structure(quiz: Dict) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    required_fields = ['question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer']
-    
-    for field in required_fields:
-        if field not in quiz or not quiz[field]:
+    for field in REQUIRED_QUIZ_FIELDS:
+        if not quiz.get(field):
             return False
     
-    if quiz['correct_answer'].upper() not in ['A', 'B', 'C', 'D']:
-        return False
-    
-    return True
+    return (quiz['correct_answer'] or '').upper() in ANSWER_LETTERS
 
 
-def create_quiz_statistics(all_results: List[Dict]) -> Dict:
+def create_quiz_statistics(all_results: List[Dict[str, Any]]) -> Dict[str, Union[int, float]]:
     """
     Create statistics from multiple quiz attempts
     
@@ -207,34 +252,49 @@ def create_quiz_statistics(all_results: List[Dict]) -> Dict:
             'improvement': 0
         }
     
-    scores = [result['percentage'] for result in all_results]
+    first = all_results[0]['percentage']
+    latest = all_results[-1]['percentage']
+    
+    if len(all_results) < NUMPY_STATS_MIN_RESULTS:
+        scores = [result['percentage'] for result in all_results]
+        average, best, worst = sum(scores) / len(scores), max(scores), min(scores)
+    else:
+        score_array = np.fromiter(
+            (result['percentage'] for result in all_results),
+            dtype=np.float64,
+            count=len(all_results)
+        )
+        average = float(score_array.mean())
+        # Read best and worst back from the results so they keep their original type
+        best = all_results[int(score_array.argmax())]['percentage']
+        worst = all_results[int(score_array.argmin())]['percentage']
     
     return {
         'total_attempts': len(all_results),
-        'average_score': round(sum(scores) / len(scores), 1),
-        'best_score': max(scores),
-        'worst_score': min(scores),
-        'latest_score': scores[-1],
-        'improvement': round(scores[-1] - scores[0], 1) if len(scores) > 1 else 0
+        'average_score': round(average, 1),
+        'best_score': best,
+        'worst_score': worst,
+        'latest_score': latest,
+        'improvement': round(latest - first, 1) if len(all_results) > 1 else 0
     }
 
 
-def generate_study_recommendations(quiz_results: List[Dict], quizzes: List[Dict]) -> List[str]:
+def generate_study_recommendations(quiz_results: List[QuizResult], quizzes: Sequence[QuizDict]) -> List[str]:
     """
     Generate study recommendations based on quiz performance
     
     Args:
-        quiz_results: List of user's quiz results
+        quiz_results: QuizResults from format_quiz_result
         quizzes: List of quiz questions
         
     Returns:
         List of recommendation strings
     """
-    recommendations = []
+    recommendations: List[str] = []
     
-    incorrect_indices = []
+    incorrect_indices: List[int] = []
     for i, result in enumerate(quiz_results):
-        if not result.get('is_correct', False):
+        if not result.is_correct:
             incorrect_indices.append(i)
     
     if len(incorrect_indices) == 0: